@@ -10,10 +10,14 @@ Prerequisites:
 
 Usage:
     python test_firestore_tools.py
+    python test_firestore_tools.py --profile
 """
 
+import argparse
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import itemgetter
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -21,6 +25,9 @@ from dotenv import load_dotenv
 env_path = Path(__file__).parent / ".env"
 load_dotenv(dotenv_path=env_path)
 
+# Test reads tolerate slightly stale Firestore data (see stale_read_kwargs)
+os.environ.setdefault('FIRESTORE_STALE_OK', '1')
+
 # Verify credentials
 cred_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
 if not cred_path:
@@ -33,21 +40,38 @@ if not Path(cred_path).exists():
 
 print(f"Using credentials: {cred_path}")
 
-# Initialize Firebase BEFORE importing tools
-from firebase_admin import credentials, initialize_app
+# Initialize Firebase BEFORE importing tools (memoized per process)
+from src.agent.firebase_bootstrap import get_app
+from src.utils.profiling import maybe_profile
 
 try:
-    cred = credentials.Certificate(cred_path)
-    initialize_app(cred)
+    get_app()
     print("Firebase initialized successfully\n")
 except Exception as e:
     print(f"Firebase initialization error: {e}")
     sys.exit(1)
 
 # Now import tools (they expect Firebase to be initialized)
+from src.agent.tools.cache import FileCache
 from src.agent.tools.stock_fundamentals_tool import StockFundamentalsTool
 from src.agent.tools.stock_universe_tool import StockUniverseTool
 
+# Local cache so repeated runs skip Firestore (data changes at most daily)
+CACHE_DIR = Path(__file__).parent / ".cache"
+
+# (label, field) pairs displayed for each fundamentals record
+FUNDAMENTAL_FIELDS = (
+    ('Name', 'name'),
+    ('Country', 'country'),
+    ('Sector', 'sector'),
+    ('Currency', 'currency'),
+    ('PE Ratio', 'pe_ratio'),
+    ('Market Cap', 'market_cap'),
+    ('ROE', 'return_on_equity'),
+    ('Dividend Yield', 'dividend_yield'),
+)
+_get_fundamental_fields = itemgetter(*(field for _, field in FUNDAMENTAL_FIELDS))
+
 
 def test_stock_universe_tool():
     """Test StockUniverseTool reads from Firestore."""
@@ -55,7 +79,7 @@ def test_stock_universe_tool():
     print("TEST 1: StockUniverseTool")
     print("=" * 60)
     
-    tool = StockUniverseTool()
+    tool = StockUniverseTool(file_cache=FileCache("stock_universe", cache_dir=CACHE_DIR))
     print(f"Tool name: {tool.name}")
     print(f"Collection: stock_universe")
     
@@ -99,7 +123,7 @@ def test_stock_fundamentals_tool():
     print("TEST 2: StockFundamentalsTool")
     print("=" * 60)
     
-    tool = StockFundamentalsTool()
+    tool = StockFundamentalsTool(file_cache=FileCache("stock_fundamentals", cache_dir=CACHE_DIR))
     print(f"Tool name: {tool.name}")
     print(f"Collection: stock_fundamentals")
     
@@ -117,15 +141,14 @@ def test_stock_fundamentals_tool():
         # Show details for first found stock
         fundamentals = data['fundamentals']
         for symbol, details in list(fundamentals.items())[:2]:
+            try:
+                values = _get_fundamental_fields(details)
+            except KeyError:
+                values = tuple(details.get(field, 'N/A') for _, field in FUNDAMENTAL_FIELDS)
+            
             print(f"\n  {symbol}:")
-            print(f"    Name: {details.get('name', 'N/A')}")
-            print(f"    Country: {details.get('country', 'N/A')}")
-            print(f"    Sector: {details.get('sector', 'N/A')}")
-            print(f"    Currency: {details.get('currency', 'N/A')}")
-            print(f"    PE Ratio: {details.get('pe_ratio', 'N/A')}")
-            print(f"    Market Cap: {details.get('market_cap', 'N/A')}")
-            print(f"    ROE: {details.get('return_on_equity', 'N/A')}")
-            print(f"    Dividend Yield: {details.get('dividend_yield', 'N/A')}")
+            for (label, _), value in zip(FUNDAMENTAL_FIELDS, values):
+                print(f"    {label}: {value}")
         
         if result.get('warning'):
             print(f"\n  Warning: {result['warning']['message']}")
@@ -137,31 +160,49 @@ def test_stock_fundamentals_tool():
     return True
 
 
+def run_test(name: str, test_func, profile: bool) -> bool:
+    """Run a test, optionally profiling it to <test>.prof; errors count as a failure."""
+    profile_file = Path(__file__).parent / f"{test_func.__name__}.prof" if profile else None
+    try:
+        with maybe_profile(profile_file):
+            return test_func()
+    except Exception as e:
+        print(f"{name} test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Verify Firestore tools")
+    parser.add_argument('--profile', action='store_true', help="Profile each test with cProfile and save <test>.prof")
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("FIRESTORE TOOLS TEST")
     print("=" * 60)
     print("Testing tools against production Firestore...\n")
     
-    success = True
+    tests = {
+        "StockUniverseTool": test_stock_universe_tool,
+        "StockFundamentalsTool": test_stock_fundamentals_tool,
+    }
     
-    try:
-        if not test_stock_universe_tool():
-            success = False
-    except Exception as e:
-        print(f"StockUniverseTool test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        success = False
+    if args.profile:
+        # cProfile only sees its own thread and allows one active profiler
+        # at a time, so profile the tests one after another
+        results = [run_test(name, test_func, True) for name, test_func in tests.items()]
+    else:
+        # The two tests read independent collections, so run them concurrently
+        # (the Firestore client is thread-safe)
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            futures = [
+                executor.submit(run_test, name, test_func, False)
+                for name, test_func in tests.items()
+            ]
+            results = [future.result() for future in as_completed(futures)]
     
-    try:
-        if not test_stock_fundamentals_tool():
-            success = False
-    except Exception as e:
-        print(f"StockFundamentalsTool test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        success = False
+    success = all(results)
     
     print("\n" + "=" * 60)
     if success:
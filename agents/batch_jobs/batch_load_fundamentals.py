@@ -8,16 +8,22 @@ Key features:
 3. Proper credit tracking with 1-minute wait when limit approached
 4. Detailed error logging with raw response capture
 5. Comprehensive summary at end of job
+6. Runs as many batches concurrently as one minute of credits allows
 
 Credit cost: 50 credits per symbol
 """
 
+import io
 import os
 import json
 import logging
+import random
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
-from typing import List, Dict, Tuple, Optional
+from functools import partial
+from typing import Any, List, Dict, Tuple, Optional
 from pathlib import Path
 
 from batch_utils import (
@@ -31,39 +37,150 @@ logger = logging.getLogger(__name__)
 # Credit cost for statistics endpoint
 STATISTICS_CREDITS = 50
 
+# Threads used to read universe files at startup
+UNIVERSE_LOAD_WORKERS = 8
+
+# Values Twelve Data uses for "no data"
+NULL_VALUES = frozenset((None, 'None', ''))
+
+
+def safe_float(value, default=None):
+    """Safely convert value to float."""
+    try:
+        if value in NULL_VALUES:
+            return default
+        return float(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def raw_value(value):
+    """Keep a field exactly as returned by the API."""
+    return value
+
+
+# A stock needs at least one of these to be worth saving
+KEY_FIELDS = ('pe_ratio', 'market_cap', 'profit_margin', 'revenue_ttm')
+
+# (output key, statistics section, source key, parser) for every extracted field
+FIELD_MAP = (
+    # Valuation metrics
+    ('pe_ratio', 'valuations', 'trailing_pe', safe_float),
+    ('forward_pe', 'valuations', 'forward_pe', safe_float),
+    ('peg_ratio', 'valuations', 'peg_ratio', safe_float),
+    ('price_to_book', 'valuations', 'price_to_book_mrq', safe_float),
+    ('price_to_sales', 'valuations', 'price_to_sales_ttm', safe_float),
+    ('ev_to_revenue', 'valuations', 'enterprise_to_revenue', safe_float),
+    ('ev_to_ebitda', 'valuations', 'enterprise_to_ebitda', safe_float),
+    ('market_cap', 'valuations', 'market_capitalization', safe_float),
+    ('enterprise_value', 'valuations', 'enterprise_value', safe_float),
+    
+    # Profitability metrics
+    ('profit_margin', 'financials', 'profit_margin', safe_float),
+    ('operating_margin', 'financials', 'operating_margin', safe_float),
+    ('gross_margin', 'financials', 'gross_margin', safe_float),
+    ('return_on_assets', 'financials', 'return_on_assets_ttm', safe_float),
+    ('return_on_equity', 'financials', 'return_on_equity_ttm', safe_float),
+    
+    # Income statement metrics
+    ('revenue_ttm', 'income_statement', 'revenue_ttm', safe_float),
+    ('revenue_per_share', 'income_statement', 'revenue_per_share_ttm', safe_float),
+    ('quarterly_revenue_growth', 'income_statement', 'quarterly_revenue_growth', safe_float),
+    ('ebitda', 'income_statement', 'ebitda', safe_float),
+    ('diluted_eps', 'income_statement', 'diluted_eps_ttm', safe_float),
+    ('quarterly_earnings_growth', 'income_statement', 'quarterly_earnings_growth_yoy', safe_float),
+    
+    # Balance sheet metrics
+    ('total_cash', 'balance_sheet', 'total_cash_mrq', safe_float),
+    ('total_debt', 'balance_sheet', 'total_debt_mrq', safe_float),
+    ('debt_to_equity', 'balance_sheet', 'total_debt_to_equity_mrq', safe_float),
+    ('current_ratio', 'balance_sheet', 'current_ratio_mrq', safe_float),
+    ('book_value_per_share', 'balance_sheet', 'book_value_per_share_mrq', safe_float),
+    
+    # Cash flow
+    ('operating_cash_flow', 'cash_flow', 'operating_cash_flow_ttm', safe_float),
+    ('free_cash_flow', 'cash_flow', 'levered_free_cash_flow_ttm', safe_float),
+    
+    # Stock statistics
+    ('shares_outstanding', 'stock_stats', 'shares_outstanding', safe_float),
+    ('float_shares', 'stock_stats', 'float_shares', safe_float),
+    ('avg_volume_10d', 'stock_stats', 'avg_10_volume', safe_float),
+    ('avg_volume_90d', 'stock_stats', 'avg_90_volume', safe_float),
+    ('shares_short', 'stock_stats', 'shares_short', safe_float),
+    ('short_ratio', 'stock_stats', 'short_ratio', safe_float),
+    ('percent_insiders', 'stock_stats', 'percent_held_by_insiders', safe_float),
+    ('percent_institutions', 'stock_stats', 'percent_held_by_institutions', safe_float),
+    
+    # Price summary / Technical
+    ('week_52_low', 'price_summary', 'fifty_two_week_low', safe_float),
+    ('week_52_high', 'price_summary', 'fifty_two_week_high', safe_float),
+    ('week_52_change', 'price_summary', 'fifty_two_week_change', safe_float),
+    ('beta', 'price_summary', 'beta', safe_float),
+    ('day_50_ma', 'price_summary', 'day_50_ma', safe_float),
+    ('day_200_ma', 'price_summary', 'day_200_ma', safe_float),
+    
+    # Dividends
+    ('dividend_yield', 'dividends', 'forward_annual_dividend_yield', safe_float),
+    ('trailing_dividend_yield', 'dividends', 'trailing_annual_dividend_yield', safe_float),
+    ('dividend_rate', 'dividends', 'forward_annual_dividend_rate', safe_float),
+    ('payout_ratio', 'dividends', 'payout_ratio', safe_float),
+    
+    # Dividend dates (kept as strings)
+    ('dividend_date', 'dividends', 'dividend_date', raw_value),
+    ('ex_dividend_date', 'dividends', 'ex_dividend_date', raw_value),
+)
+
 
 # Global tracking for detailed summary
 class JobStats:
     """Track detailed statistics for the job summary."""
+    __slots__ = (
+        'successful',
+        'failed_parse_symbols', 'failed_parse_reasons', 'failed_parse_snippets',
+        'failed_no_data_symbols', 'failed_no_data_reasons',
+        'failed_api_error_symbols', 'failed_api_error_messages',
+        'failed_batch', 'sanitized_responses', 'retries_needed',
+    )
+    
     def __init__(self):
-        self.total_processed = 0
         self.successful = []  # List of symbols
-        self.failed_parse = []  # List of (symbol, reason, raw_response_snippet)
-        self.failed_no_data = []  # List of (symbol, reason)
-        self.failed_api_error = []  # List of (symbol, error_message)
+        # Failures are stored as parallel lists (one per column) rather than
+        # lists of tuples, so symbols can be gathered by plain list concatenation
+        self.failed_parse_symbols = []
+        self.failed_parse_reasons = []
+        self.failed_parse_snippets = []  # Raw response snippets (or None)
+        self.failed_no_data_symbols = []
+        self.failed_no_data_reasons = []
+        self.failed_api_error_symbols = []
+        self.failed_api_error_messages = []
         self.failed_batch = []  # List of symbols from failed batches
         self.sanitized_responses = []  # List of symbols where JSON was sanitized
         self.retries_needed = 0
     
+    @property
+    def total_processed(self) -> int:
+        """Stocks recorded as succeeded or failed (derived, so it cannot drift)."""
+        return (len(self.successful) + len(self.failed_parse_symbols) + len(self.failed_no_data_symbols) +
+                len(self.failed_api_error_symbols) + len(self.failed_batch))
+    
     def add_success(self, symbol: str):
         self.successful.append(symbol)
-        self.total_processed += 1
     
     def add_failed_parse(self, symbol: str, reason: str, raw_snippet: str = None):
-        self.failed_parse.append((symbol, reason, raw_snippet))
-        self.total_processed += 1
+        self.failed_parse_symbols.append(symbol)
+        self.failed_parse_reasons.append(reason)
+        self.failed_parse_snippets.append(raw_snippet)
     
     def add_failed_no_data(self, symbol: str, reason: str):
-        self.failed_no_data.append((symbol, reason))
-        self.total_processed += 1
+        self.failed_no_data_symbols.append(symbol)
+        self.failed_no_data_reasons.append(reason)
     
     def add_failed_api_error(self, symbol: str, error_msg: str):
-        self.failed_api_error.append((symbol, error_msg))
-        self.total_processed += 1
+        self.failed_api_error_symbols.append(symbol)
+        self.failed_api_error_messages.append(error_msg)
     
     def add_failed_batch(self, symbol: str):
         self.failed_batch.append(symbol)
-        self.total_processed += 1
     
     def add_sanitized(self, symbol: str):
         self.sanitized_responses.append(symbol)
@@ -73,167 +190,202 @@ class JobStats:
     
     def get_all_failed(self) -> List[str]:
         """Get all failed symbols."""
-        failed = []
-        failed.extend([s for s, _, _ in self.failed_parse])
-        failed.extend([s for s, _ in self.failed_no_data])
-        failed.extend([s for s, _ in self.failed_api_error])
-        failed.extend(self.failed_batch)
-        return failed
+        return [*self.failed_parse_symbols, *self.failed_no_data_symbols,
+                *self.failed_api_error_symbols, *self.failed_batch]
     
     def print_summary(self, elapsed_minutes: float, output_dir: Path):
-        """Print comprehensive summary."""
-        total_failed = len(self.get_all_failed())
+        """Print comprehensive summary (buffered and written to stdout in one call)."""
+        buf = io.StringIO()
+        out = partial(print, file=buf)
+        all_failed = self.get_all_failed()
+        total_failed = len(all_failed)
         
-        print("\n" + "="*70)
-        print("FUNDAMENTALS JOB - DETAILED SUMMARY")
-        print("="*70)
+        out("\n" + "="*70)
+        out("FUNDAMENTALS JOB - DETAILED SUMMARY")
+        out("="*70)
         
         # Section 1: Overview
-        print("\n[1] OVERVIEW")
-        print(f"    Total stocks processed: {self.total_processed}")
-        print(f"    Successfully saved: {len(self.successful)}")
-        print(f"    Failed: {total_failed}")
-        print(f"    Elapsed time: {elapsed_minutes:.1f} minutes")
-        print(f"    Output directory: {output_dir}")
+        out("\n[1] OVERVIEW")
+        total_processed = self.total_processed
+        out(f"    Total stocks processed: {total_processed}")
+        out(f"    Successfully saved: {len(self.successful)}")
+        out(f"    Failed: {total_failed}")
+        out(f"    Elapsed time: {elapsed_minutes:.1f} minutes")
+        out(f"    Output directory: {output_dir}")
         
         # Section 2: Success rate
-        if self.total_processed > 0:
-            success_rate = (len(self.successful) / self.total_processed) * 100
-            print(f"    Success rate: {success_rate:.1f}%")
+        if total_processed > 0:
+            success_rate = (len(self.successful) / total_processed) * 100
+            out(f"    Success rate: {success_rate:.1f}%")
         
         # Section 3: Bad responses handled
-        print("\n[2] BAD RESPONSES (handled by sanitization rules)")
+        out("\n[2] BAD RESPONSES (handled by sanitization rules)")
         if self.sanitized_responses:
-            print(f"    Count: {len(self.sanitized_responses)}")
-            print(f"    Stocks: {', '.join(self.sanitized_responses[:20])}")
+            out(f"    Count: {len(self.sanitized_responses)}")
+            out(f"    Stocks: {', '.join(self.sanitized_responses[:20])}")
             if len(self.sanitized_responses) > 20:
-                print(f"    ... and {len(self.sanitized_responses) - 20} more")
+                out(f"    ... and {len(self.sanitized_responses) - 20} more")
         else:
-            print("    None - all responses were clean JSON")
+            out("    None - all responses were clean JSON")
         
         # Section 4: Failed stocks - detailed breakdown
-        print("\n[3] FAILED STOCKS - BREAKDOWN")
+        out("\n[3] FAILED STOCKS - BREAKDOWN")
         
         # 4a: Parse failures
-        if self.failed_parse:
-            print(f"\n    [3a] Parse Failures ({len(self.failed_parse)}):")
-            for symbol, reason, snippet in self.failed_parse[:10]:
-                print(f"         - {symbol}: {reason}")
+        if self.failed_parse_symbols:
+            out(f"\n    [3a] Parse Failures ({len(self.failed_parse_symbols)}):")
+            for symbol, reason, snippet in zip(self.failed_parse_symbols[:10], self.failed_parse_reasons,
+                                               self.failed_parse_snippets):
+                out(f"         - {symbol}: {reason}")
                 if snippet:
                     # Log snippet to file, show truncated in console
-                    print(f"           Response snippet: {snippet[:100]}...")
-            if len(self.failed_parse) > 10:
-                print(f"         ... and {len(self.failed_parse) - 10} more")
+                    out(f"           Response snippet: {snippet[:100]}...")
+            if len(self.failed_parse_symbols) > 10:
+                out(f"         ... and {len(self.failed_parse_symbols) - 10} more")
         
         # 4b: No meaningful data
-        if self.failed_no_data:
-            print(f"\n    [3b] No Meaningful Data ({len(self.failed_no_data)}):")
-            for symbol, reason in self.failed_no_data[:10]:
-                print(f"         - {symbol}: {reason}")
-            if len(self.failed_no_data) > 10:
-                print(f"         ... and {len(self.failed_no_data) - 10} more")
+        if self.failed_no_data_symbols:
+            out(f"\n    [3b] No Meaningful Data ({len(self.failed_no_data_symbols)}):")
+            for symbol, reason in zip(self.failed_no_data_symbols[:10], self.failed_no_data_reasons):
+                out(f"         - {symbol}: {reason}")
+            if len(self.failed_no_data_symbols) > 10:
+                out(f"         ... and {len(self.failed_no_data_symbols) - 10} more")
         
         # 4c: API errors
-        if self.failed_api_error:
-            print(f"\n    [3c] API Errors ({len(self.failed_api_error)}):")
-            for symbol, error_msg in self.failed_api_error[:10]:
-                print(f"         - {symbol}: {error_msg}")
-            if len(self.failed_api_error) > 10:
-                print(f"         ... and {len(self.failed_api_error) - 10} more")
+        if self.failed_api_error_symbols:
+            out(f"\n    [3c] API Errors ({len(self.failed_api_error_symbols)}):")
+            for symbol, error_msg in zip(self.failed_api_error_symbols[:10], self.failed_api_error_messages):
+                out(f"         - {symbol}: {error_msg}")
+            if len(self.failed_api_error_symbols) > 10:
+                out(f"         ... and {len(self.failed_api_error_symbols) - 10} more")
         
         # 4d: Batch failures
         if self.failed_batch:
-            print(f"\n    [3d] Batch Failures - retries exhausted ({len(self.failed_batch)}):")
-            print(f"         Stocks: {', '.join(self.failed_batch[:20])}")
+            out(f"\n    [3d] Batch Failures - retries exhausted ({len(self.failed_batch)}):")
+            out(f"         Stocks: {', '.join(self.failed_batch[:20])}")
             if len(self.failed_batch) > 20:
-                print(f"         ... and {len(self.failed_batch) - 20} more")
+                out(f"         ... and {len(self.failed_batch) - 20} more")
         
         # Section 5: Complete list of failed stocks
-        all_failed = self.get_all_failed()
         if all_failed:
-            print(f"\n[4] COMPLETE LIST OF FAILED STOCKS ({len(all_failed)}):")
+            out(f"\n[4] COMPLETE LIST OF FAILED STOCKS ({len(all_failed)}):")
             # Print in rows of 10
             for i in range(0, len(all_failed), 10):
-                print(f"    {', '.join(all_failed[i:i+10])}")
+                out(f"    {', '.join(all_failed[i:i+10])}")
         else:
-            print("\n[4] NO FAILED STOCKS - All processed successfully!")
+            out("\n[4] NO FAILED STOCKS - All processed successfully!")
         
         # Section 6: Retry statistics
-        print(f"\n[5] RETRY STATISTICS")
-        print(f"    Batches that needed retry: {self.retries_needed}")
+        out(f"\n[5] RETRY STATISTICS")
+        out(f"    Batches that needed retry: {self.retries_needed}")
         
-        print("\n" + "="*70)
+        out("\n" + "="*70)
+        
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
     
     def log_to_file(self, log_path: Path):
-        """Log detailed failure information to a separate file."""
-        with open(log_path, 'w', encoding='utf-8') as f:
-            f.write("FUNDAMENTALS JOB - DETAILED FAILURE LOG\n")
-            f.write(f"Generated: {datetime.now().isoformat()}\n")
-            f.write("="*70 + "\n\n")
-            
-            if self.failed_parse:
-                f.write("PARSE FAILURES:\n")
-                f.write("-"*50 + "\n")
-                for symbol, reason, snippet in self.failed_parse:
-                    f.write(f"\nSymbol: {symbol}\n")
-                    f.write(f"Reason: {reason}\n")
-                    if snippet:
-                        f.write(f"Raw Response:\n{snippet}\n")
-                f.write("\n")
-            
-            if self.failed_no_data:
-                f.write("NO MEANINGFUL DATA:\n")
-                f.write("-"*50 + "\n")
-                for symbol, reason in self.failed_no_data:
-                    f.write(f"{symbol}: {reason}\n")
-                f.write("\n")
-            
-            if self.failed_api_error:
-                f.write("API ERRORS:\n")
-                f.write("-"*50 + "\n")
-                for symbol, error_msg in self.failed_api_error:
-                    f.write(f"{symbol}: {error_msg}\n")
-                f.write("\n")
-            
-            if self.failed_batch:
-                f.write("BATCH FAILURES (retries exhausted):\n")
-                f.write("-"*50 + "\n")
-                f.write(", ".join(self.failed_batch) + "\n")
+        """Log detailed failure information to a separate file (one write)."""
+        parts = [
+            "FUNDAMENTALS JOB - DETAILED FAILURE LOG\n",
+            f"Generated: {datetime.now().isoformat()}\n",
+            "="*70 + "\n\n",
+        ]
+        
+        if self.failed_parse_symbols:
+            parts.append("PARSE FAILURES:\n")
+            parts.append("-"*50 + "\n")
+            for symbol, reason, snippet in zip(self.failed_parse_symbols, self.failed_parse_reasons,
+                                               self.failed_parse_snippets):
+                parts.append(f"\nSymbol: {symbol}\n")
+                parts.append(f"Reason: {reason}\n")
+                if snippet:
+                    parts.append(f"Raw Response:\n{snippet}\n")
+            parts.append("\n")
+        
+        if self.failed_no_data_symbols:
+            parts.append("NO MEANINGFUL DATA:\n")
+            parts.append("-"*50 + "\n")
+            for symbol, reason in zip(self.failed_no_data_symbols, self.failed_no_data_reasons):
+                parts.append(f"{symbol}: {reason}\n")
+            parts.append("\n")
+        
+        if self.failed_api_error_symbols:
+            parts.append("API ERRORS:\n")
+            parts.append("-"*50 + "\n")
+            for symbol, error_msg in zip(self.failed_api_error_symbols, self.failed_api_error_messages):
+                parts.append(f"{symbol}: {error_msg}\n")
+            parts.append("\n")
+        
+        if self.failed_batch:
+            parts.append("BATCH FAILURES (retries exhausted):\n")
+            parts.append("-"*50 + "\n")
+            parts.append(", ".join(self.failed_batch) + "\n")
+        
+        log_path.write_text("".join(parts), encoding='utf-8')
 
 
 # Global job stats instance
 job_stats = JobStats()
 
 
+def stocks_from_universe_file(json_file: Path) -> List[Dict[str, str]]:
+    """
+    Extract the stocks from a single universe JSON file.
+    """
+    data = load_json(json_file)
+    if not data or 'stocks' not in data:
+        return []
+    
+    # Low-cardinality strings are interned so every stock shares one copy
+    country = sys.intern(data.get('country', ''))
+    sector = sys.intern(data.get('sector', ''))
+    
+    return [
+        {
+            'symbol': stock['symbol'],
+            'name': stock['name'],
+            'exchange': sys.intern(stock.get('exchange', '')),
+            'market_cap_tier': sys.intern(stock.get('market_cap_tier', 'unknown')),
+            'country': country,
+            'sector': sector
+        }
+        for stock in data['stocks']
+    ]
+
+
 def collect_stocks_from_universe(universe_dir: Path) -> List[Dict[str, str]]:
     """
     Collect all stocks from universe JSON files.
+    Files are read and parsed in parallel; results keep the file order.
     """
     all_stocks = []
     
-    for json_file in universe_dir.glob("*.json"):
-        data = load_json(json_file)
-        if data and 'stocks' in data:
-            country = data.get('country', '')
-            sector = data.get('sector', '')
-            
-            for stock in data['stocks']:
-                all_stocks.append({
-                    'symbol': stock['symbol'],
-                    'name': stock['name'],
-                    'exchange': stock.get('exchange', ''),
-                    'market_cap_tier': stock.get('market_cap_tier', 'unknown'),
-                    'country': country,
-                    'sector': sector
-                })
+    with ThreadPoolExecutor(max_workers=UNIVERSE_LOAD_WORKERS) as executor:
+        for stocks in executor.map(stocks_from_universe_file, universe_dir.glob("*.json")):
+            all_stocks.extend(stocks)
     
     logger.info(f"Collected {len(all_stocks)} stocks from universe files")
     return all_stocks
 
 
+def response_snippet(response: Any, limit: int = 2000) -> Optional[str]:
+    """
+    Serialize a request response for error logging, truncated to limit chars.
+    Only called on failure paths so successful responses are never re-dumped.
+    """
+    if not response:
+        return None
+    try:
+        return json.dumps(response, indent=2)[:limit]
+    except (TypeError, ValueError):
+        return str(response)[:limit]
+
+
 def parse_statistics_response(symbol: str, exchange: str, name: str, 
                               country: str, sector: str, stats_data: Dict,
-                              raw_response_str: str = None) -> Optional[Dict]:
+                              raw_response: Any = None, now_iso: str = None,
+                              stats: Optional[JobStats] = None) -> Optional[Dict]:
     """
     Parse Twelve Data statistics response into our standard format.
     
@@ -244,51 +396,50 @@ def parse_statistics_response(symbol: str, exchange: str, name: str,
         country: Country
         sector: Sector
         stats_data: Parsed statistics data
-        raw_response_str: Raw response string for error logging
+        raw_response: Raw request response, serialized only for error logging
+        now_iso: last_updated timestamp, computed once per batch by the caller
+        stats: Where parse failures are recorded (default: the job's job_stats)
     
     Returns:
         Parsed fundamentals dict or None if parsing failed
     """
-    
-    def safe_float(value, default=None):
-        """Safely convert value to float."""
-        try:
-            if value is None or value == 'None' or value == '':
-                return default
-            return float(value)
-        except (ValueError, TypeError):
-            return default
+    if stats is None:
+        stats = job_stats
     
     # Check if we have valid statistics data
     if not stats_data:
         logger.warning(f"{symbol}: Empty stats_data")
+        raw_response_str = response_snippet(raw_response)
         logger.warning(f"{symbol}: RAW RESPONSE: {raw_response_str[:500] if raw_response_str else 'N/A'}")
-        job_stats.add_failed_parse(symbol, "Empty stats_data", raw_response_str[:1000] if raw_response_str else None)
+        stats.add_failed_parse(symbol, "Empty stats_data", raw_response_str[:1000] if raw_response_str else None)
         return None
     
     # Validate stats_data is a dict
     if not isinstance(stats_data, dict):
         logger.warning(f"{symbol}: stats_data is not a dict, type: {type(stats_data)}")
+        raw_response_str = response_snippet(raw_response)
         logger.warning(f"{symbol}: RAW RESPONSE: {raw_response_str[:500] if raw_response_str else 'N/A'}")
-        job_stats.add_failed_parse(symbol, f"stats_data is {type(stats_data)}, not dict", 
-                                   raw_response_str[:1000] if raw_response_str else None)
+        stats.add_failed_parse(symbol, f"stats_data is {type(stats_data)}, not dict", 
+                               raw_response_str[:1000] if raw_response_str else None)
         return None
     
-    logger.debug(f"{symbol}: stats_data keys: {list(stats_data.keys())}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%s: stats_data keys: %s", symbol, list(stats_data.keys()))
     
     # Handle case where stats_data might be the response wrapper
     if 'statistics' not in stats_data:
         # Check if this is a nested response structure
         if 'response' in stats_data and isinstance(stats_data['response'], dict):
-            logger.debug(f"{symbol}: Unwrapping 'response' layer")
+            logger.debug("%s: Unwrapping 'response' layer", symbol)
             stats_data = stats_data['response']
         
         if 'statistics' not in stats_data:
             available_keys = list(stats_data.keys())
             logger.warning(f"{symbol}: No 'statistics' key in response. Available keys: {available_keys}")
+            raw_response_str = response_snippet(raw_response)
             logger.warning(f"{symbol}: RAW RESPONSE: {raw_response_str[:500] if raw_response_str else 'N/A'}")
-            job_stats.add_failed_parse(symbol, f"No 'statistics' key. Keys: {available_keys}", 
-                                       raw_response_str[:1000] if raw_response_str else None)
+            stats.add_failed_parse(symbol, f"No 'statistics' key. Keys: {available_keys}", 
+                                   raw_response_str[:1000] if raw_response_str else None)
             return None
     
     statistics = stats_data.get('statistics', {})
@@ -296,12 +447,14 @@ def parse_statistics_response(symbol: str, exchange: str, name: str,
     # Check if statistics is empty
     if not statistics:
         logger.warning(f"{symbol}: 'statistics' object is empty")
+        raw_response_str = response_snippet(raw_response)
         logger.warning(f"{symbol}: RAW RESPONSE: {raw_response_str[:500] if raw_response_str else 'N/A'}")
-        job_stats.add_failed_parse(symbol, "'statistics' object is empty", 
-                                   raw_response_str[:1000] if raw_response_str else None)
+        stats.add_failed_parse(symbol, "'statistics' object is empty", 
+                               raw_response_str[:1000] if raw_response_str else None)
         return None
     
-    logger.debug(f"{symbol}: statistics keys: {list(statistics.keys())}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%s: statistics keys: %s", symbol, list(statistics.keys()))
     
     meta = stats_data.get('meta', {})
     valuations = statistics.get('valuations_metrics', {})
@@ -310,6 +463,18 @@ def parse_statistics_response(symbol: str, exchange: str, name: str,
     price_summary = statistics.get('stock_price_summary', {})
     dividends = statistics.get('dividends_and_splits', {})
     
+    # Resolve every statistics section once
+    sections = {
+        'valuations': valuations,
+        'financials': financials,
+        'income_statement': financials.get('income_statement') or {},
+        'balance_sheet': financials.get('balance_sheet') or {},
+        'cash_flow': financials.get('cash_flow') or {},
+        'stock_stats': stock_stats,
+        'price_summary': price_summary,
+        'dividends': dividends,
+    }
+    
     # Build fundamentals document
     fundamentals = {
         # Identity
@@ -319,102 +484,129 @@ def parse_statistics_response(symbol: str, exchange: str, name: str,
         'currency': meta.get('currency', ''),  # e.g., USD, INR, EUR, CAD
         'country': country,
         'sector': sector,
-        
-        # Valuation metrics
-        'pe_ratio': safe_float(valuations.get('trailing_pe')),
-        'forward_pe': safe_float(valuations.get('forward_pe')),
-        'peg_ratio': safe_float(valuations.get('peg_ratio')),
-        'price_to_book': safe_float(valuations.get('price_to_book_mrq')),
-        'price_to_sales': safe_float(valuations.get('price_to_sales_ttm')),
-        'ev_to_revenue': safe_float(valuations.get('enterprise_to_revenue')),
-        'ev_to_ebitda': safe_float(valuations.get('enterprise_to_ebitda')),
-        'market_cap': safe_float(valuations.get('market_capitalization')),
-        'enterprise_value': safe_float(valuations.get('enterprise_value')),
-        
-        # Profitability metrics
-        'profit_margin': safe_float(financials.get('profit_margin')),
-        'operating_margin': safe_float(financials.get('operating_margin')),
-        'gross_margin': safe_float(financials.get('gross_margin')),
-        'return_on_assets': safe_float(financials.get('return_on_assets_ttm')),
-        'return_on_equity': safe_float(financials.get('return_on_equity_ttm')),
-        
-        # Income statement metrics
-        'revenue_ttm': safe_float(financials.get('income_statement', {}).get('revenue_ttm')),
-        'revenue_per_share': safe_float(financials.get('income_statement', {}).get('revenue_per_share_ttm')),
-        'quarterly_revenue_growth': safe_float(financials.get('income_statement', {}).get('quarterly_revenue_growth')),
-        'ebitda': safe_float(financials.get('income_statement', {}).get('ebitda')),
-        'diluted_eps': safe_float(financials.get('income_statement', {}).get('diluted_eps_ttm')),
-        'quarterly_earnings_growth': safe_float(financials.get('income_statement', {}).get('quarterly_earnings_growth_yoy')),
-        
-        # Balance sheet metrics
-        'total_cash': safe_float(financials.get('balance_sheet', {}).get('total_cash_mrq')),
-        'total_debt': safe_float(financials.get('balance_sheet', {}).get('total_debt_mrq')),
-        'debt_to_equity': safe_float(financials.get('balance_sheet', {}).get('total_debt_to_equity_mrq')),
-        'current_ratio': safe_float(financials.get('balance_sheet', {}).get('current_ratio_mrq')),
-        'book_value_per_share': safe_float(financials.get('balance_sheet', {}).get('book_value_per_share_mrq')),
-        
-        # Cash flow
-        'operating_cash_flow': safe_float(financials.get('cash_flow', {}).get('operating_cash_flow_ttm')),
-        'free_cash_flow': safe_float(financials.get('cash_flow', {}).get('levered_free_cash_flow_ttm')),
-        
-        # Stock statistics
-        'shares_outstanding': safe_float(stock_stats.get('shares_outstanding')),
-        'float_shares': safe_float(stock_stats.get('float_shares')),
-        'avg_volume_10d': safe_float(stock_stats.get('avg_10_volume')),
-        'avg_volume_90d': safe_float(stock_stats.get('avg_90_volume')),
-        'shares_short': safe_float(stock_stats.get('shares_short')),
-        'short_ratio': safe_float(stock_stats.get('short_ratio')),
-        'percent_insiders': safe_float(stock_stats.get('percent_held_by_insiders')),
-        'percent_institutions': safe_float(stock_stats.get('percent_held_by_institutions')),
-        
-        # Price summary / Technical
-        'week_52_low': safe_float(price_summary.get('fifty_two_week_low')),
-        'week_52_high': safe_float(price_summary.get('fifty_two_week_high')),
-        'week_52_change': safe_float(price_summary.get('fifty_two_week_change')),
-        'beta': safe_float(price_summary.get('beta')),
-        'day_50_ma': safe_float(price_summary.get('day_50_ma')),
-        'day_200_ma': safe_float(price_summary.get('day_200_ma')),
-        
-        # Dividends
-        'dividend_yield': safe_float(dividends.get('forward_annual_dividend_yield')),
-        'trailing_dividend_yield': safe_float(dividends.get('trailing_annual_dividend_yield')),
-        'dividend_rate': safe_float(dividends.get('forward_annual_dividend_rate')),
-        'payout_ratio': safe_float(dividends.get('payout_ratio')),
-        'dividend_date': dividends.get('dividend_date'),
-        'ex_dividend_date': dividends.get('ex_dividend_date'),
-        
-        # Metadata
-        'last_updated': datetime.now(timezone.utc).isoformat(),
-        'data_source': 'Twelve Data'
     }
     
+    # Metrics (valuation, profitability, income, balance sheet, cash flow,
+    # stock statistics, price summary, dividends)
+    for out_key, section, src_key, parser in FIELD_MAP:
+        fundamentals[out_key] = parser(sections[section].get(src_key))
+    
+    # Metadata
+    fundamentals['last_updated'] = now_iso or datetime.now(timezone.utc).isoformat()
+    fundamentals['data_source'] = 'Twelve Data'
+
+    
     # Log extracted key metrics for debugging
-    logger.debug(f"{symbol}: pe_ratio={fundamentals['pe_ratio']}, market_cap={fundamentals['market_cap']}, "
-                 f"profit_margin={fundamentals['profit_margin']}, revenue_ttm={fundamentals['revenue_ttm']}")
+    logger.debug("%s: pe_ratio=%s, market_cap=%s, profit_margin=%s, revenue_ttm=%s", symbol,
+                 fundamentals['pe_ratio'], fundamentals['market_cap'],
+                 fundamentals['profit_margin'], fundamentals['revenue_ttm'])
     
     # Check if we have any meaningful data
-    has_data = any([
-        fundamentals['pe_ratio'] is not None,
-        fundamentals['market_cap'] is not None,
-        fundamentals['profit_margin'] is not None,
-        fundamentals['revenue_ttm'] is not None
-    ])
+    has_data = any(fundamentals[key] is not None for key in KEY_FIELDS)
     
     if not has_data:
         reason = (f"All key metrics None - pe:{fundamentals['pe_ratio']}, "
                   f"mktcap:{fundamentals['market_cap']}, margin:{fundamentals['profit_margin']}, "
                   f"rev:{fundamentals['revenue_ttm']}")
         logger.warning(f"{symbol}: No meaningful data - {reason}")
-        job_stats.add_failed_no_data(symbol, reason)
+        stats.add_failed_no_data(symbol, reason)
         return None
     
     return fundamentals
 
 
+def statistics_cache_path(cache_dir: Path, symbol: str, exchange: str) -> Path:
+    """Path of the cached raw /statistics response for a (symbol, mic_code)."""
+    return cache_dir / f"{symbol}__{exchange or 'default'}.raw.json"
+
+
+def load_cached_statistics(cache_dir: Path, symbol: str, exchange: str,
+                           ttl_hours: float) -> Optional[Dict]:
+    """
+    Load a cached raw /statistics response if it is younger than ttl_hours.
+    """
+    cache_file = statistics_cache_path(cache_dir, symbol, exchange)
+    try:
+        age_hours = (time.time() - cache_file.stat().st_mtime) / 3600
+    except OSError:
+        return None
+    
+    if age_hours > ttl_hours:
+        return None
+    return load_json(cache_file)
+
+
+def apply_statistics_cache(stocks: List[Dict], config: BatchConfig
+                           ) -> Tuple[List[Tuple[str, Path, Dict]], List[Dict]]:
+    """
+    Build fundamentals from fresh cached responses without calling the API.
+    
+    Nothing is written here; pass the returned writes to save_batch_results
+    once the run is confirmed.
+    
+    Returns:
+        Tuple of (pending fundamentals writes, stocks that still need to be fetched)
+    """
+    pending_writes = []
+    uncached = []
+    now_iso = datetime.now(timezone.utc).isoformat()
+    cache_stats = JobStats()  # Unusable entries are fetched again, so keep them out of job_stats
+    
+    for stock in stocks:
+        symbol = stock['symbol']
+        stats_data = load_cached_statistics(config.statistics_cache_dir, symbol, stock.get('exchange', ''),
+                                            config.td_statistics_cache_ttl_hours)
+        fundamentals = None
+        if stats_data is not None:
+            fundamentals = parse_statistics_response(
+                symbol=symbol,
+                exchange=stock.get('exchange', ''),
+                name=stock['name'],
+                country=stock.get('country', ''),
+                sector=stock.get('sector', ''),
+                stats_data=stats_data,
+                raw_response=stats_data,
+                now_iso=now_iso,
+                stats=cache_stats
+            )
+        
+        if fundamentals is None:
+            uncached.append(stock)
+        else:
+            pending_writes.append((symbol, config.fundamentals_dir / f"{symbol}.json", fundamentals))
+    
+    logger.info(f"Found {len(pending_writes)} stocks in the statistics cache")
+    return pending_writes, uncached
+
+
+def save_batch_results(pending_writes: List[Tuple[str, Path, Dict]], tracker: ProgressTracker,
+                       cache_writes: List[Tuple[Path, Dict]] = ()):
+    """
+    Write a batch's fundamentals files in parallel, then mark them completed.
+    
+    Stocks are only marked completed once their file is on disk, so an
+    interrupted job re-fetches anything that was not written. Raw responses
+    in cache_writes are written alongside.
+    """
+    if not pending_writes:
+        return
+    
+    files = [(output_file, fundamentals) for _, output_file, fundamentals in pending_writes]
+    files.extend(cache_writes)
+    with ThreadPoolExecutor(max_workers=len(files)) as executor:
+        list(executor.map(lambda item: save_json(item[1], item[0]), files))
+    
+    for symbol, _, _ in pending_writes:
+        tracker.mark_completed(symbol)
+        job_stats.add_success(symbol)
+
+
 def process_batch(batch_stocks: List[Dict], client: TwelveDataClient, 
-                  fundamentals_dir: Path, tracker: ProgressTracker) -> Tuple[int, int, bool]:
+                  fundamentals_dir: Path, tracker: ProgressTracker,
+                  cache_dir: Optional[Path] = None) -> Tuple[int, int, bool]:
     """
     Process a batch of stocks using the /batch endpoint.
+    Raw responses of parsed stocks are cached in cache_dir when given.
     
     Returns:
         Tuple of (success_count, failure_count, batch_failed)
@@ -423,6 +615,8 @@ def process_batch(batch_stocks: List[Dict], client: TwelveDataClient,
     success_count = 0
     failure_count = 0
     rate_limit_in_batch = False  # Track if any request in batch hit rate limit
+    pending_writes = []  # (symbol, output file, fundamentals) saved at end of batch
+    cache_writes = []  # (cache file, raw statistics response)
     
     # Build batch request
     requests_dict = {}
@@ -434,7 +628,8 @@ def process_batch(batch_stocks: List[Dict], client: TwelveDataClient,
         requests_dict[req_id] = {"url": url}
         stock_mapping[req_id] = stock
     
-    logger.debug(f"Batch request URLs: {[r['url'].split('apikey=')[0] for r in requests_dict.values()]}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Batch request URLs: %s", [r['url'].split('apikey=')[0] for r in requests_dict.values()])
     
     # Execute batch and get both parsed response and raw text
     response, raw_response_text, was_sanitized = client.execute_batch_with_raw(requests_dict)
@@ -458,25 +653,16 @@ def process_batch(batch_stocks: List[Dict], client: TwelveDataClient,
     else:
         batch_data = response
     
+    # One timestamp for every stock in this batch
+    now_iso = datetime.now(timezone.utc).isoformat()
+    
     # Process each response
     for req_id, stock in stock_mapping.items():
         symbol = stock['symbol']
         
-        # Skip if already completed
-        if tracker.is_completed(symbol):
-            success_count += 1
-            continue
-        
         # Get response for this request
         req_response = batch_data.get(req_id, {})
         
-        # Extract raw response for this specific request for logging
-        raw_req_response = None
-        try:
-            raw_req_response = json.dumps(req_response, indent=2)[:2000] if req_response else None
-        except:
-            raw_req_response = str(req_response)[:2000] if req_response else None
-        
         if not req_response:
             logger.warning(f"{symbol}: No response for {req_id}")
             logger.warning(f"{symbol}: Full batch response keys: {list(batch_data.keys())}")
@@ -523,21 +709,21 @@ def process_batch(batch_stocks: List[Dict], client: TwelveDataClient,
                 stats_data = req_response
         else:
             logger.warning(f"{symbol}: Unexpected response type: {type(req_response)}")
+            raw_req_response = response_snippet(req_response)
             logger.warning(f"{symbol}: RAW RESPONSE: {raw_req_response}")
             job_stats.add_failed_parse(symbol, f"Unexpected response type: {type(req_response)}", raw_req_response)
             tracker.mark_failed(symbol, f"Unexpected response type", "parse_error")
             failure_count += 1
             continue
         
-        # Log what we're parsing
-        if isinstance(stats_data, dict):
-            logger.info(f"{symbol}: Parsing stats_data with keys: {list(stats_data.keys())}")
-            if 'statistics' in stats_data:
-                logger.info(f"{symbol}: Found 'statistics' key")
+        # Log what we're parsing (per-symbol detail, debug only)
+        if logger.isEnabledFor(logging.DEBUG):
+            if isinstance(stats_data, dict):
+                logger.debug("%s: Parsing stats_data with keys: %s", symbol, list(stats_data.keys()))
+                if 'statistics' not in stats_data:
+                    logger.debug("%s: NO 'statistics' key - will check nested response", symbol)
             else:
-                logger.info(f"{symbol}: NO 'statistics' key - will check nested response")
-        else:
-            logger.info(f"{symbol}: stats_data is NOT a dict, type: {type(stats_data)}")
+                logger.debug("%s: stats_data is NOT a dict, type: %s", symbol, type(stats_data))
         
         # Parse the statistics
         fundamentals = parse_statistics_response(
@@ -547,7 +733,8 @@ def process_batch(batch_stocks: List[Dict], client: TwelveDataClient,
             country=stock.get('country', ''),
             sector=stock.get('sector', ''),
             stats_data=stats_data,
-            raw_response_str=raw_req_response
+            raw_response=req_response,
+            now_iso=now_iso
         )
         
         if fundamentals is None:
@@ -555,17 +742,19 @@ def process_batch(batch_stocks: List[Dict], client: TwelveDataClient,
             failure_count += 1
             continue
         
-        # Save to JSON file
-        output_file = fundamentals_dir / f"{symbol}.json"
-        save_json(fundamentals, output_file)
-        
-        tracker.mark_completed(symbol)
-        job_stats.add_success(symbol)
+        # Queue the JSON file; all files are written together after the loop
+        pending_writes.append((symbol, fundamentals_dir / f"{symbol}.json", fundamentals))
+        if cache_dir:
+            cache_writes.append((statistics_cache_path(cache_dir, symbol, stock.get('exchange', '')), stats_data))
         success_count += 1
         
-        pe_str = f"PE: {fundamentals.get('pe_ratio')}" if fundamentals.get('pe_ratio') else "PE: N/A"
-        mc_str = f"MktCap: {fundamentals.get('market_cap'):,.0f}" if fundamentals.get('market_cap') else "MktCap: N/A"
-        logger.info(f"[OK] {symbol}: Saved ({pe_str}, {mc_str})")
+        if logger.isEnabledFor(logging.INFO):
+            pe_ratio = fundamentals.get('pe_ratio')
+            market_cap = fundamentals.get('market_cap')
+            logger.info("[OK] %s: Parsed (PE: %s, MktCap: %s)", symbol, pe_ratio or "N/A",
+                        f"{market_cap:,.0f}" if market_cap else "N/A")
+    
+    save_batch_results(pending_writes, tracker, cache_writes)
     
     # If any request in batch hit rate limit, signal batch retry
     if rate_limit_in_batch:
@@ -575,6 +764,104 @@ def process_batch(batch_stocks: List[Dict], client: TwelveDataClient,
     return success_count, failure_count, False
 
 
+def jittered(seconds: float) -> float:
+    """Spread a wait by +/-10% so concurrent workers don't retry in lockstep."""
+    return seconds * random.uniform(0.9, 1.1)
+
+
+def run_batch(batch_num: int, total_batches: int, batch_stocks: List[Dict],
+              client: TwelveDataClient, config: BatchConfig,
+              tracker: ProgressTracker, credit_tracker: CreditTracker) -> Tuple[int, int]:
+    """
+    Process one batch with retries. Runs on a worker thread.
+    
+    Returns:
+        Tuple of (success_count, failure_count)
+    
+    Raises:
+        RateLimitExceeded: If the API reports the account limit is exhausted
+    """
+    max_retries = 3
+    completed_earlier = 0  # Stocks saved by an earlier attempt of this batch
+    
+    logger.info(f"BATCH {batch_num}/{total_batches} - {len(batch_stocks)} stocks")
+    
+    for retry in range(max_retries):
+        try:
+            # Reserve credits BEFORE each attempt (including retries)
+            # Credits are consumed regardless of success/failure
+            credit_tracker.reserve_credits(len(batch_stocks) * STATISTICS_CREDITS)
+            print(f"\nBatch {batch_num}/{total_batches} - attempt {retry + 1}/{max_retries} ({credit_tracker.get_summary()})")
+            
+            # Process batch
+            success, failed, batch_failed = process_batch(
+                batch_stocks, client, config.fundamentals_dir, tracker,
+                config.statistics_cache_dir if config.td_statistics_cache_ttl_hours > 0 else None
+            )
+            
+            if batch_failed:
+                # Batch request failed (e.g., malformed JSON or rate limit hit)
+                if retry < max_retries - 1:
+                    job_stats.increment_retries()
+                    logger.warning(f"Batch {batch_num} failed, retry {retry + 2}/{max_retries}...")
+                    print(f"  [!] Batch {batch_num} failed, will retry after credit reset...")
+                    # Force wait for next minute to ensure rate limit is cleared
+                    # This handles both malformed JSON (rare) and rate limit (more common)
+                    credit_tracker.force_wait_for_reset()
+                    # Only re-request the stocks that were not saved this attempt
+                    pending = [stock for stock in batch_stocks if not tracker.is_completed(stock['symbol'])]
+                    completed_earlier += len(batch_stocks) - len(pending)
+                    batch_stocks = pending
+                    if not batch_stocks:
+                        return completed_earlier, 0
+                    continue
+                break
+            
+            # Batch succeeded (even if some individual stocks failed)
+            success += completed_earlier
+            print(f"  Batch {batch_num}: [OK] {success} success, [X] {failed} failed")
+            
+            # Only pause between batches when this minute's credits run low
+            delay = credit_tracker.suggest_delay()
+            if delay:
+                time.sleep(delay)
+            return success, failed
+            
+        except RateLimitExceeded as e:
+            # Without a Retry-After the limit is final for this run
+            if e.retry_after is None:
+                raise
+            if retry < max_retries - 1:
+                job_stats.increment_retries()
+                wait_seconds = jittered(e.retry_after)
+                print(f"  [!] Batch {batch_num}: rate limited, retrying in {wait_seconds:.0f}s...")
+                time.sleep(wait_seconds)
+                continue
+            break
+            
+        except Exception as e:
+            logger.error(f"Unexpected error in batch {batch_num}: {e}")
+            import traceback
+            traceback.print_exc()
+            if retry < max_retries - 1:
+                job_stats.increment_retries()
+                print(f"  [!] Batch {batch_num}: error occurred, will retry...")
+                # Exponential backoff: ~5s, ~10s, ...
+                time.sleep(jittered(5 * 2 ** retry))
+                continue
+            break
+    
+    # All retries exhausted, mark the stocks that were never saved as failed
+    logger.error(f"Batch {batch_num} failed after {max_retries} retries")
+    pending = [stock for stock in batch_stocks if not tracker.is_completed(stock['symbol'])]
+    completed_earlier += len(batch_stocks) - len(pending)
+    for stock in pending:
+        tracker.mark_failed(stock['symbol'], "Batch failed after retries", "network")
+        job_stats.add_failed_batch(stock['symbol'])
+    print(f"  [X] Batch {batch_num} failed after {max_retries} attempts")
+    return completed_earlier, len(pending)
+
+
 def main():
     global job_stats
     job_stats = JobStats()  # Reset stats for this run
@@ -618,9 +905,17 @@ def main():
     tracker = ProgressTracker("fundamentals", config.progress_dir)
     tracker.set_total(len(all_stocks))
     
-    # Filter out already completed
-    remaining_stocks = [s for s in all_stocks if not tracker.is_completed(s['symbol'])]
+    # Filter out already completed, so batches only carry work that needs credits
+    completed = tracker.completed_items()
+    remaining_stocks = [s for s in all_stocks if s['symbol'] not in completed]
     logger.info(f"Remaining after filtering completed: {len(remaining_stocks)}")
+    already_completed = len(all_stocks) - len(remaining_stocks)
+    
+    # Reuse recent raw responses instead of spending credits on them again
+    cached_writes = []
+    if config.td_statistics_cache_ttl_hours > 0:
+        cached_writes, remaining_stocks = apply_statistics_cache(remaining_stocks, config)
+        logger.info(f"Remaining after statistics cache: {len(remaining_stocks)}")
     
     # Calculate batches
     batch_size = config.td_batch_size
@@ -630,7 +925,8 @@ def main():
     print(f"\nBatch Processing Configuration:")
     print(f"  Mode: {config.mode}")
     print(f"  Total stocks: {len(all_stocks)}")
-    print(f"  Already completed: {len(all_stocks) - len(remaining_stocks)}")
+    print(f"  Already completed: {already_completed}")
+    print(f"  From statistics cache: {len(cached_writes)}")
     print(f"  Remaining: {len(remaining_stocks)}")
     print(f"  Batch size: {batch_size} stocks")
     print(f"  Total batches: {len(batches)}")
@@ -650,107 +946,68 @@ def main():
         print("Aborted")
         return
     
-    # Process batches
+    # Only touch files and progress once the run is confirmed
+    if cached_writes:
+        save_batch_results(cached_writes, tracker)
+        print(f"  Saved {len(cached_writes)} stocks from the statistics cache")
+    
+    # Process batches concurrently: as many in flight as one minute of credits allows
     total_success = 0
     total_failed = 0
     start_time = datetime.now()
-    max_retries = 3
+    # One worker per batch that fits in a credit window, plus one extra that
+    # waits for the next window while the others are still in flight
+    max_concurrent = max(1, batches_per_minute) + 1
+    print(f"  Concurrent batches: {max_concurrent}")
     
-    for batch_num, batch_stocks in enumerate(batches, 1):
-        credits_needed = len(batch_stocks) * STATISTICS_CREDITS
+    executor = ThreadPoolExecutor(max_workers=max_concurrent)
+    futures = {
+        executor.submit(
+            run_batch, batch_num, len(batches), batch_stocks,
+            client, config, tracker, credit_tracker
+        ): batch_num
+        for batch_num, batch_stocks in enumerate(batches, 1)
+    }
+    
+    try:
+        for batches_done, future in enumerate(as_completed(futures), 1):
+            success, failed = future.result()
+            total_success += success
+            total_failed += failed
+            
+            # Progress update every 10 batches
+            if batches_done % 10 == 0:
+                elapsed = (datetime.now() - start_time).total_seconds() / 60
+                print(f"\n  === Progress: {tracker.get_summary()} ===")
+                print(f"  === Elapsed: {elapsed:.1f} min, Retries: {job_stats.retries_needed}, {credit_tracker.get_summary()} ===\n")
         
-        logger.info(f"BATCH {batch_num}/{len(batches)} - {len(batch_stocks)} stocks")
-        print(f"\nBatch {batch_num}/{len(batches)}")
+    except RateLimitExceeded as e:
+        executor.shutdown(wait=False, cancel_futures=True)
+        logger.error(f"Rate limit exceeded: {e}")
+        tracker.mark_rate_limit_reached()
         
-        # Retry loop for this batch
-        for retry in range(max_retries):
-            try:
-                # Wait for credits BEFORE each attempt (including retries)
-                credit_tracker.wait_for_credits(credits_needed)
-                print(f"  Attempt {retry + 1}/{max_retries} ({credit_tracker.get_summary()})")
-                
-                # Process batch
-                success, failed, batch_failed = process_batch(
-                    batch_stocks, client, config.fundamentals_dir, tracker
-                )
-                
-                # Credits are consumed regardless of success/failure
-                credit_tracker.use_credits(credits_needed)
-                
-                if batch_failed:
-                    # Batch request failed (e.g., malformed JSON or rate limit hit)
-                    if retry < max_retries - 1:
-                        job_stats.increment_retries()
-                        logger.warning(f"Batch {batch_num} failed, retry {retry + 2}/{max_retries}...")
-                        print(f"  [!] Batch failed, will retry after credit reset...")
-                        # Force wait for next minute to ensure rate limit is cleared
-                        # This handles both malformed JSON (rare) and rate limit (more common)
-                        credit_tracker.force_wait_for_reset()
-                        continue
-                    else:
-                        # All retries exhausted, mark stocks as failed
-                        logger.error(f"Batch {batch_num} failed after {max_retries} retries")
-                        for stock in batch_stocks:
-                            if not tracker.is_completed(stock['symbol']):
-                                tracker.mark_failed(stock['symbol'], "Batch failed after retries", "network")
-                                job_stats.add_failed_batch(stock['symbol'])
-                        total_failed += len(batch_stocks)
-                        print(f"  [X] Batch failed after {max_retries} attempts")
-                        break
-                
-                # Batch succeeded (even if some individual stocks failed)
-                total_success += success
-                total_failed += failed
-                
-                print(f"  [OK] {success} success, [X] {failed} failed")
-                break  # Exit retry loop
-                
-            except RateLimitExceeded as e:
-                logger.error(f"Rate limit exceeded: {e}")
-                tracker.mark_rate_limit_reached()
-                
-                print("\n" + "="*70)
-                print("API RATE LIMIT REACHED")
-                print("="*70)
-                print(f"Stopped at batch {batch_num}/{len(batches)}")
-                print(f"Progress saved. Run again to resume.")
-                
-                # Print summary even on early exit
-                elapsed = (datetime.now() - start_time).total_seconds() / 60
-                job_stats.print_summary(elapsed, config.fundamentals_dir)
-                return
-                
-            except KeyboardInterrupt:
-                print("\n\nInterrupted by user. Progress saved.")
-                print(f"Run again to resume from batch {batch_num}")
-                
-                # Print summary even on interrupt
-                elapsed = (datetime.now() - start_time).total_seconds() / 60
-                job_stats.print_summary(elapsed, config.fundamentals_dir)
-                return
-                
-            except Exception as e:
-                logger.error(f"Unexpected error in batch {batch_num}: {e}")
-                import traceback
-                traceback.print_exc()
-                # Credits were likely consumed, so record them
-                credit_tracker.use_credits(credits_needed)
-                if retry < max_retries - 1:
-                    job_stats.increment_retries()
-                    print(f"  [!] Error occurred, will retry...")
-                    time.sleep(5)
-                    continue
-                break
+        print("\n" + "="*70)
+        print("API RATE LIMIT REACHED")
+        print("="*70)
+        print(f"Stopped after {tracker.get_summary()}")
+        print(f"Progress saved. Run again to resume.")
+        
+        # Print summary even on early exit
+        elapsed = (datetime.now() - start_time).total_seconds() / 60
+        job_stats.print_summary(elapsed, config.fundamentals_dir)
+        return
         
-        # Progress update every 10 batches
-        if batch_num % 10 == 0:
-            elapsed = (datetime.now() - start_time).total_seconds() / 60
-            print(f"\n  === Progress: {tracker.get_summary()} ===")
-            print(f"  === Elapsed: {elapsed:.1f} min, Retries: {job_stats.retries_needed}, {credit_tracker.get_summary()} ===\n")
+    except KeyboardInterrupt:
+        executor.shutdown(wait=False, cancel_futures=True)
+        print("\n\nInterrupted by user. Progress saved.")
+        print("Run again to resume")
         
-        # Small delay between batches
-        if batch_num < len(batches):
-            time.sleep(2)
+        # Print summary even on interrupt
+        elapsed = (datetime.now() - start_time).total_seconds() / 60
+        job_stats.print_summary(elapsed, config.fundamentals_dir)
+        return
+    
+    executor.shutdown()
     
     # Final summary
     elapsed = (datetime.now() - start_time).total_seconds() / 60
@@ -13,7 +13,7 @@ Outputs:
 - Error log: macro_errors_{timestamp}.log
 
 Usage:
-    python batch_load_macro.py
+    python batch_load_macro.py [--max-concurrency N] [--mode prompt|download|cache|auto]
 
 Reads API keys from: agents/.env
     - FRED_API_KEY
@@ -23,9 +23,19 @@ Output directory: agents/batch_jobs/batch_output/macro/
 
 import os
 import json
+import argparse
+import hashlib
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
+import threading
 import traceback
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from contextlib import nullcontext
+from functools import lru_cache, partial
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Any, Optional, Tuple, List
@@ -43,12 +53,26 @@ WORLD_BANK_BASE = "https://api.worldbank.org/v2"
 # Rate limits (calls per minute)
 FRED_RATE_LIMIT = 100
 
+# World Bank has no published limit; keep the free API to a few parallel calls
+WORLD_BANK_CONCURRENCY = 3
+
 # Delays (seconds)
-FRED_DELAY = 1  # Minimal delay for 100 calls/min
-RATE_LIMIT_WAIT = 60  # Wait time when rate limit hit
+RATE_LIMIT_WAIT = 60  # Wait time when rate limit hit and no Retry-After given
 
 # Retry configuration
 MAX_RETRIES = 3
+BACKOFF_BASE = 1  # Seconds; urllib3 doubles this per retry
+
+# Requests in flight at once, independent of the rate limit:
+# 0 = unlimited, 1 = one at a time (legacy serial behaviour), >1 = bounded
+MAX_CONCURRENCY = int(os.getenv("MACRO_MAX_CONCURRENCY", "6"))
+
+# Reuse API responses younger than this on reruns (0 disables the cache)
+CACHE_TTL_HOURS = float(os.getenv("MACRO_CACHE_TTL_HOURS", "6"))
+
+# Monthly/quarterly/annual series change rarely, so their responses are kept
+# longer; series marked 'daily' below use CACHE_TTL_HOURS
+SLOW_SERIES_CACHE_TTL_HOURS = float(os.getenv("MACRO_SLOW_CACHE_TTL_HOURS", "24"))
 
 # FRED Series IDs - USA
 USA_SERIES = {
@@ -74,6 +98,7 @@ USA_SERIES = {
         'series_id': 'EFFR',
         'units': 'lin',  # Direct value
         'limit': 30,  # Fetch ~30 days for monthly average
+        'daily': True,
         'description': 'Effective Federal Funds Rate (%)'
     }
 }
@@ -128,6 +153,18 @@ EU_SERIES = {
     }
 }
 
+# FRED query per series (everything but the API key), built once at import
+FRED_QUERIES = {
+    config['series_id']: {
+        "series_id": config['series_id'],
+        "limit": config['limit'],
+        "sort_order": "desc",
+        "units": config['units']
+    }
+    for series in (USA_SERIES, CANADA_SERIES, EU_SERIES)
+    for config in series.values()
+}
+
 # World Bank Indicator Codes - India
 INDIA_INDICATORS = {
     'gdp_growth': {
@@ -150,39 +187,94 @@ INDIA_INDICATORS = {
 # =============================================================================
 
 class RateLimitTracker:
-    """Track API calls and handle rate limiting."""
+    """
+    Sliding-window rate limiter for an API provider.
+    Allows at most `limit` calls in any 60-second window, so the full
+    per-minute quota is usable without ever exceeding it. Thread-safe.
+    """
+    
+    WINDOW_SECONDS = 60.0
     
-    def __init__(self, provider: str, limit: int, delay: float):
+    def __init__(self, provider: str, limit: int):
         self.provider = provider
         self.limit = limit
-        self.delay = delay
-        self.calls_this_minute = 0
-        self.minute_start = time.time()
-    
-    def wait_if_needed(self):
-        """Wait for delay between calls."""
-        time.sleep(self.delay)
-    
-    def record_call(self):
-        """Record an API call."""
-        self.calls_this_minute += 1
-    
-    def handle_rate_limit_error(self):
-        """Handle rate limit error - wait 60 seconds and reset."""
-        print(f"  Rate limit hit for {self.provider}, waiting {RATE_LIMIT_WAIT}s...")
-        time.sleep(RATE_LIMIT_WAIT)
-        self.calls_this_minute = 0
-        self.minute_start = time.time()
+        self.calls = deque()  # monotonic times of calls in the current window
+        self.resume_at = 0.0  # set after a 429 so every worker backs off
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a call fits in the window, then record it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self.calls and now - self.calls[0] >= self.WINDOW_SECONDS:
+                    self.calls.popleft()
+                
+                if now < self.resume_at:
+                    wait_seconds = self.resume_at - now
+                elif len(self.calls) < self.limit:
+                    self.calls.append(now)
+                    return
+                else:
+                    wait_seconds = self.WINDOW_SECONDS - (now - self.calls[0])
+            time.sleep(wait_seconds)
+    
+    def handle_rate_limit_error(self, retry_after: Optional[float] = None):
+        """Handle rate limit error - hold all calls for Retry-After seconds (or 60)."""
+        wait_seconds = retry_after if retry_after is not None else RATE_LIMIT_WAIT
+        print(f"  Rate limit hit for {self.provider}, waiting {wait_seconds:.0f}s...")
+        with self._lock:
+            self.resume_at = max(self.resume_at, time.monotonic() + wait_seconds)
+        time.sleep(wait_seconds)
 
 
 # Global tracker
-fred_tracker = RateLimitTracker("FRED", FRED_RATE_LIMIT, FRED_DELAY)
+fred_tracker = RateLimitTracker("FRED", FRED_RATE_LIMIT)
+
+# Shared HTTP session: keep-alive connections are reused across all indicators.
+# 429/5xx responses and connection errors are retried by urllib3 with
+# exponential backoff, honouring Retry-After; the final failed response is
+# returned so raise_for_status() reports it.
+HTTP_RETRY = Retry(
+    total=MAX_RETRIES,
+    backoff_factor=BACKOFF_BASE,
+    status_forcelist=(429, 500, 502, 503, 504),
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=HTTP_RETRY))
+
+
+def make_request_slots(max_concurrency: int):
+    """Build the context manager that bounds in-flight requests (see MAX_CONCURRENCY)."""
+    if max_concurrency <= 0:
+        return nullcontext()
+    return threading.BoundedSemaphore(max_concurrency)
+
+
+# Shared by every provider (set from --max-concurrency in main)
+request_slots = make_request_slots(MAX_CONCURRENCY)
 
 
 # =============================================================================
 # ERROR LOGGING
 # =============================================================================
 
+LOG_RULE = "=" * 80
+LOG_DIVIDER = "-" * 80
+
+
+def log_timestamp() -> str:
+    """Current local time for log entries (formatted at most once per second)."""
+    return _format_log_second(int(time.time()))
+
+
+@lru_cache(maxsize=1)
+def _format_log_second(epoch_second: int) -> str:
+    return datetime.fromtimestamp(epoch_second).strftime('%Y-%m-%d %H:%M:%S')
+
+
 class ErrorLogger:
     """Handles detailed error logging to file."""
     
@@ -191,6 +283,22 @@ class ErrorLogger:
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         self.log_file = output_dir / f"macro_errors_{timestamp}.log"
         self.has_errors = False
+        self._lock = threading.Lock()  # Indicators are fetched from worker threads
+        self._fh = None  # Opened on the first error so clean runs leave no log
+    
+    def _write(self, log_entry: str):
+        """Append an entry to the log, keeping one buffered handle open."""
+        with self._lock:
+            if self._fh is None:
+                self._fh = open(self.log_file, 'a', encoding='utf-8', buffering=1 << 16)
+            self._fh.write(log_entry)
+    
+    def close(self):
+        """Flush and close the log file, if anything was written."""
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
     
     def log_error(self, 
                   country: str,
@@ -205,41 +313,36 @@ class ErrorLogger:
         """Log detailed error information."""
         self.has_errors = True
         
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        timestamp = log_timestamp()
         
         # Redact API keys from parameters
         safe_params = self._redact_keys(parameters)
         
-        log_entry = f"""
-================================================================================
+        parts = [f"""
+{LOG_RULE}
 [{timestamp}] ERROR - API Call Failed
-================================================================================
+{LOG_RULE}
 Country: {country}
 Indicator: {indicator}
 Endpoint: {endpoint}
-Parameters: {json.dumps(safe_params, indent=2)}
---------------------------------------------------------------------------------
+Parameters: {format_json(safe_params)}
+{LOG_DIVIDER}
 Error Type: {error_type}
 Error Message: {error_message}
---------------------------------------------------------------------------------
-"""
+{LOG_DIVIDER}
+"""]
         if extra_context:
-            log_entry += f"Context: {extra_context}\n--------------------------------------------------------------------------------\n"
+            parts.append(f"Context: {extra_context}\n{LOG_DIVIDER}\n")
         
         if raw_response is not None:
-            if isinstance(raw_response, (dict, list)):
-                raw_str = json.dumps(raw_response, indent=2)
-            else:
-                raw_str = str(raw_response)
-            log_entry += f"Raw Response:\n{raw_str}\n--------------------------------------------------------------------------------\n"
+            parts.append(f"Raw Response:\n{format_json(raw_response)}\n{LOG_DIVIDER}\n")
         
         if stack_trace:
-            log_entry += f"Stack Trace:\n{stack_trace}\n"
+            parts.append(f"Stack Trace:\n{stack_trace}\n")
         
-        log_entry += "================================================================================\n"
+        parts.append(f"{LOG_RULE}\n")
         
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            f.write(log_entry)
+        self._write("".join(parts))
     
     def log_unexpected_response(self,
                                 country: str,
@@ -252,64 +355,132 @@ Error Message: {error_message}
         """Log when response doesn't match expected structure."""
         self.has_errors = True
         
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        timestamp = log_timestamp()
         safe_params = self._redact_keys(parameters)
         
         log_entry = f"""
-================================================================================
+{LOG_RULE}
 [{timestamp}] WARNING - Unexpected Response Structure
-================================================================================
+{LOG_RULE}
 Country: {country}
 Indicator: {indicator}
 Endpoint: {endpoint}
-Parameters: {json.dumps(safe_params, indent=2)}
---------------------------------------------------------------------------------
+Parameters: {format_json(safe_params)}
+{LOG_DIVIDER}
 Expected: {expected}
 Actual Keys/Type: {actual}
---------------------------------------------------------------------------------
+{LOG_DIVIDER}
 Raw Response:
-{json.dumps(raw_response, indent=2) if isinstance(raw_response, (dict, list)) else str(raw_response)}
-================================================================================
+{format_json(raw_response)}
+{LOG_RULE}
 """
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            f.write(log_entry)
+        self._write(log_entry)
     
     def _redact_keys(self, params: Dict) -> Dict:
         """Redact API keys from parameters."""
-        safe = params.copy()
-        for key in ['api_key', 'apikey', 'api-key']:
-            if key in safe:
-                safe[key] = '***REDACTED***'
-        return safe
+        return redact_keys(params)
+
+
+def format_json(value: Any) -> str:
+    """Pretty-print a dict/list for the error log; anything else is str()'d."""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, indent=2, ensure_ascii=False)
+    return str(value)
+
+
+def redact_keys(params: Dict) -> Dict:
+    """Redact API keys from parameters."""
+    safe = params.copy()
+    for key in ['api_key', 'apikey', 'api-key']:
+        if key in safe:
+            safe[key] = '***REDACTED***'
+    return safe
 
 
 # Global error logger (initialized in main)
 error_logger: ErrorLogger = None
 
 
+# =============================================================================
+# RESPONSE CACHE
+# =============================================================================
+
+class ResponseCache:
+    """
+    On-disk cache of successful API responses, one JSON file per request.
+    Keyed by endpoint and parameters (API keys redacted), expired by file age.
+    """
+    
+    def __init__(self, cache_dir: Path, ttl_hours: float):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_hours * 3600
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    def _path(self, endpoint: str, parameters: Dict) -> Path:
+        """Get the cache file for a request."""
+        key_source = json.dumps({"endpoint": endpoint, "parameters": redact_keys(parameters)}, sort_keys=True)
+        key = hashlib.blake2b(key_source.encode('utf-8'), digest_size=16).hexdigest()
+        return self.cache_dir / f"{key}.json"
+    
+    def get(self, endpoint: str, parameters: Dict, ttl_hours: Optional[float] = None) -> Optional[Any]:
+        """Get a cached response if it has not expired (ttl_hours overrides the default TTL)."""
+        cache_file = self._path(endpoint, parameters)
+        ttl_seconds = self.ttl_seconds if ttl_hours is None else ttl_hours * 3600
+        try:
+            if time.time() - cache_file.stat().st_mtime > ttl_seconds:
+                return None
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+    
+    def set(self, endpoint: str, parameters: Dict, response: Any):
+        """Store a response."""
+        with open(self._path(endpoint, parameters), 'w', encoding='utf-8') as f:
+            json.dump(response, f)
+
+
+# Global response cache (initialized in main; None disables caching)
+response_cache: Optional[ResponseCache] = None
+
+
 # =============================================================================
 # API FETCH FUNCTIONS
 # =============================================================================
 
 def fetch_with_retry(fetch_func, tracker: RateLimitTracker, country: str, indicator: str, 
-                     endpoint: str, parameters: Dict) -> Tuple[Optional[Dict], bool]:
+                     endpoint: str, parameters: Dict,
+                     cache_ttl_hours: Optional[float] = None) -> Tuple[Optional[Dict], bool]:
     """
     Execute fetch function with retry logic.
+    A cached response younger than cache_ttl_hours (default CACHE_TTL_HOURS)
+    is returned without a request.
     
     Returns:
         Tuple of (response_data, success_flag)
     """
+    if response_cache:
+        cached = response_cache.get(endpoint, parameters, cache_ttl_hours)
+        if cached is not None:
+            return cached, True
+    
+    # HTTP-level retries (429/5xx, connection errors) happen inside SESSION;
+    # this loop only retries FRED's in-body rate-limit errors
     for attempt in range(1, MAX_RETRIES + 1):
         try:
-            tracker.wait_if_needed()
-            tracker.record_call()
+            tracker.acquire()
             
-            response = fetch_func()
+            with request_slots:
+                response = fetch_func()
             
             # Check for rate limit in response
             if isinstance(response, dict):
                 # FRED error response
                 if 'error_code' in response or 'error_message' in response:
+                    # Retryable rate limits are only logged once they run out
+                    if response.get('error_code') == 429 and attempt < MAX_RETRIES:
+                        tracker.handle_rate_limit_error()
+                        continue
                     error_logger.log_error(
                         country=country,
                         indicator=indicator,
@@ -319,53 +490,23 @@ def fetch_with_retry(fetch_func, tracker: RateLimitTracker, country: str, indica
                         error_message=response.get('error_message', 'Unknown API error'),
                         raw_response=response
                     )
-                    if response.get('error_code') == 429:
-                        tracker.handle_rate_limit_error()
-                        continue
                     return None, False
             
+            if response_cache:
+                response_cache.set(endpoint, parameters, response)
             return response, True
             
         except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 429:
-                error_logger.log_error(
-                    country=country,
-                    indicator=indicator,
-                    endpoint=endpoint,
-                    parameters=parameters,
-                    error_type="HTTPError",
-                    error_message=f"429 Too Many Requests (attempt {attempt}/{MAX_RETRIES})",
-                    raw_response=e.response.text if e.response else None,
-                    stack_trace=traceback.format_exc()
-                )
-                tracker.handle_rate_limit_error()
-                continue
-            else:
-                error_logger.log_error(
-                    country=country,
-                    indicator=indicator,
-                    endpoint=endpoint,
-                    parameters=parameters,
-                    error_type="HTTPError",
-                    error_message=str(e),
-                    raw_response=e.response.text if e.response else None,
-                    stack_trace=traceback.format_exc()
-                )
-                return None, False
-                
-        except requests.exceptions.RequestException as e:
             error_logger.log_error(
                 country=country,
                 indicator=indicator,
                 endpoint=endpoint,
                 parameters=parameters,
-                error_type=type(e).__name__,
+                error_type="HTTPError",
                 error_message=str(e),
+                raw_response=e.response.text if e.response is not None else None,
                 stack_trace=traceback.format_exc()
             )
-            if attempt < MAX_RETRIES:
-                time.sleep(5 * attempt)  # Exponential backoff for network errors
-                continue
             return None, False
             
         except Exception as e:
@@ -384,258 +525,93 @@ def fetch_with_retry(fetch_func, tracker: RateLimitTracker, country: str, indica
 
 
 # =============================================================================
-# USA - FRED
+# USA / CANADA / EU - FRED
 # =============================================================================
 
-def download_usa_data(api_key: str) -> Dict[str, Any]:
+def fetch_fred_indicator(api_key: str, country: str, indicator: str, config: Dict) -> Tuple[Dict, bool]:
     """
-    Fetch USA macroeconomic data from FRED.
+    Fetch one FRED series and build its raw request entry.
     
-    Series:
-    - GDPC1: Real GDP (with pc1 transformation)
-    - CPIAUCSL: CPI (with pc1 transformation)
-    - LRHUTTTTUSM156S: Harmonized Unemployment Rate
-    - EFFR: Effective Federal Funds Rate
-    
-    Returns raw data structure with metadata.
+    Returns:
+        Tuple of (request_entry, success_flag)
     """
-    print("Fetching USA data (FRED)...")
-    
-    raw_data = {
-        "fetch_timestamp": datetime.now(timezone.utc).isoformat(),
-        "api_provider": "FRED",
-        "country": "USA",
-        "requests": []
+    query = FRED_QUERIES[config['series_id']]
+    params = {**query, "api_key": api_key, "file_type": "json"}
+    
+    def do_fetch():
+        response = SESSION.get(FRED_BASE, params=params, timeout=30)
+        response.raise_for_status()
+        return json.loads(response.content)
+    
+    result, success = fetch_with_retry(
+        fetch_func=do_fetch,
+        tracker=fred_tracker,
+        country=country,
+        indicator=indicator,
+        endpoint=FRED_BASE,
+        parameters=params,
+        cache_ttl_hours=None if config.get('daily') else SLOW_SERIES_CACHE_TTL_HOURS
+    )
+    
+    request_entry = {
+        "indicator": indicator,
+        "series_id": config['series_id'],
+        "units": config['units'],
+        "endpoint": FRED_BASE,
+        "parameters": query,
+        "status": "success" if success else "failed",
+        "response": result
     }
     
-    for indicator, config in USA_SERIES.items():
-        print(f"  - {indicator}...", end=" ", flush=True)
-        
-        params = {
-            "series_id": config['series_id'],
-            "api_key": api_key,
-            "file_type": "json",
-            "limit": config['limit'],
-            "sort_order": "desc",
-            "units": config['units']
-        }
-        
-        def do_fetch():
-            response = requests.get(FRED_BASE, params=params, timeout=30)
-            response.raise_for_status()
-            return response.json()
-        
-        result, success = fetch_with_retry(
-            fetch_func=do_fetch,
-            tracker=fred_tracker,
-            country="USA",
-            indicator=indicator,
-            endpoint=FRED_BASE,
-            parameters=params
-        )
-        
-        request_entry = {
-            "indicator": indicator,
-            "series_id": config['series_id'],
-            "units": config['units'],
-            "endpoint": FRED_BASE,
-            "parameters": {
-                "series_id": config['series_id'],
-                "limit": config['limit'],
-                "sort_order": "desc",
-                "units": config['units']
-            },
-            "status": "success" if success else "failed",
-            "response": result
-        }
-        
-        # Validate response structure
-        if success and result:
-            if "observations" not in result:
-                error_logger.log_unexpected_response(
-                    country="USA",
-                    indicator=indicator,
-                    endpoint=FRED_BASE,
-                    parameters=params,
-                    expected="'observations' key in response",
-                    actual=list(result.keys()) if isinstance(result, dict) else type(result).__name__,
-                    raw_response=result
-                )
-                request_entry["status"] = "unexpected_structure"
-        
-        raw_data["requests"].append(request_entry)
-        print("✓" if success else "✗")
+    # Validate response structure
+    if success and result:
+        if "observations" not in result:
+            error_logger.log_unexpected_response(
+                country=country,
+                indicator=indicator,
+                endpoint=FRED_BASE,
+                parameters=params,
+                expected="'observations' key in response",
+                actual=list(result.keys()) if isinstance(result, dict) else type(result).__name__,
+                raw_response=result
+            )
+            request_entry["status"] = "unexpected_structure"
     
-    return raw_data
+    return request_entry, success
 
 
-# =============================================================================
-# CANADA - FRED
-# =============================================================================
-
-def download_canada_data(api_key: str) -> Dict[str, Any]:
+def download_fred_data(api_key: str, country: str, series: Dict[str, Dict],
+                       source: str = "FRED") -> Dict[str, Any]:
     """
-    Fetch Canada macroeconomic data from FRED.
+    Fetch a country's macroeconomic data from FRED.
     
-    Series:
-    - NGDPRSAXDCCAQ: Real GDP (with pc1 transformation)
-    - CPALTT01CAQ659N: CPI Inflation (already percentage)
-    - LRHUTTTTCAM156S: Harmonized Unemployment Rate
-    - IRSTCI01CAM156N: Interest Rate
+    Args:
+        api_key: FRED API key
+        country: Country name stored in the raw data (USA, Canada, EU)
+        series: Indicator -> series config (USA_SERIES, CANADA_SERIES, EU_SERIES)
+        source: Provider label for the progress output
     
     Returns raw data structure with metadata.
     """
-    print("Fetching Canada data (FRED)...")
-    
     raw_data = {
         "fetch_timestamp": datetime.now(timezone.utc).isoformat(),
         "api_provider": "FRED",
-        "country": "Canada",
+        "country": country,
         "requests": []
     }
     
-    for indicator, config in CANADA_SERIES.items():
-        print(f"  - {indicator}...", end=" ", flush=True)
-        
-        params = {
-            "series_id": config['series_id'],
-            "api_key": api_key,
-            "file_type": "json",
-            "limit": config['limit'],
-            "sort_order": "desc",
-            "units": config['units']
-        }
-        
-        def do_fetch():
-            response = requests.get(FRED_BASE, params=params, timeout=30)
-            response.raise_for_status()
-            return response.json()
-        
-        result, success = fetch_with_retry(
-            fetch_func=do_fetch,
-            tracker=fred_tracker,
-            country="Canada",
-            indicator=indicator,
-            endpoint=FRED_BASE,
-            parameters=params
-        )
-        
-        request_entry = {
-            "indicator": indicator,
-            "series_id": config['series_id'],
-            "units": config['units'],
-            "endpoint": FRED_BASE,
-            "parameters": {
-                "series_id": config['series_id'],
-                "limit": config['limit'],
-                "sort_order": "desc",
-                "units": config['units']
-            },
-            "status": "success" if success else "failed",
-            "response": result
-        }
-        
-        # Validate response structure
-        if success and result:
-            if "observations" not in result:
-                error_logger.log_unexpected_response(
-                    country="Canada",
-                    indicator=indicator,
-                    endpoint=FRED_BASE,
-                    parameters=params,
-                    expected="'observations' key in response",
-                    actual=list(result.keys()) if isinstance(result, dict) else type(result).__name__,
-                    raw_response=result
-                )
-                request_entry["status"] = "unexpected_structure"
-        
-        raw_data["requests"].append(request_entry)
-        print("✓" if success else "✗")
-    
-    return raw_data
-
-
-# =============================================================================
-# EU - FRED (Eurozone EA20)
-# =============================================================================
-
-def download_eu_data(api_key: str) -> Dict[str, Any]:
-    """
-    Fetch EU (Eurozone EA20) macroeconomic data from FRED.
-    
-    Series:
-    - CLV10MEURB1GQSCAEA20Q: Real GDP EA20 (with pc1 transformation)
-    - CP00MI15EA20M086NEST: HICP EA20 (with pc1 transformation)
-    - LRHUTTTTEZM156S: Unemployment Rate
+    # Fetch all indicators concurrently; results keep the series order
+    with ThreadPoolExecutor(max_workers=len(series)) as executor:
+        results = list(executor.map(
+            lambda item: fetch_fred_indicator(api_key, country, *item), series.items()
+        ))
     
-    Returns raw data structure with metadata.
-    """
-    print("Fetching EU data (FRED - Eurozone EA20)...")
-    
-    raw_data = {
-        "fetch_timestamp": datetime.now(timezone.utc).isoformat(),
-        "api_provider": "FRED",
-        "country": "EU",
-        "requests": []
-    }
-    
-    for indicator, config in EU_SERIES.items():
-        print(f"  - {indicator}...", end=" ", flush=True)
-        
-        params = {
-            "series_id": config['series_id'],
-            "api_key": api_key,
-            "file_type": "json",
-            "limit": config['limit'],
-            "sort_order": "desc",
-            "units": config['units']
-        }
-        
-        def do_fetch():
-            response = requests.get(FRED_BASE, params=params, timeout=30)
-            response.raise_for_status()
-            return response.json()
-        
-        result, success = fetch_with_retry(
-            fetch_func=do_fetch,
-            tracker=fred_tracker,
-            country="EU",
-            indicator=indicator,
-            endpoint=FRED_BASE,
-            parameters=params
-        )
-        
-        request_entry = {
-            "indicator": indicator,
-            "series_id": config['series_id'],
-            "units": config['units'],
-            "endpoint": FRED_BASE,
-            "parameters": {
-                "series_id": config['series_id'],
-                "limit": config['limit'],
-                "sort_order": "desc",
-                "units": config['units']
-            },
-            "status": "success" if success else "failed",
-            "response": result
-        }
-        
-        # Validate response structure
-        if success and result:
-            if "observations" not in result:
-                error_logger.log_unexpected_response(
-                    country="EU",
-                    indicator=indicator,
-                    endpoint=FRED_BASE,
-                    parameters=params,
-                    expected="'observations' key in response",
-                    actual=list(result.keys()) if isinstance(result, dict) else type(result).__name__,
-                    raw_response=result
-                )
-                request_entry["status"] = "unexpected_structure"
-        
+    # Report in one write so countries fetched in parallel don't interleave
+    lines = [f"Fetching {country} data ({source})..."]
+    for indicator, (request_entry, success) in zip(series, results):
         raw_data["requests"].append(request_entry)
-        print("✓" if success else "✗")
+        lines.append(f"  - {indicator}... {'✓' if success else '✗'}")
+    print("\n".join(lines))
     
     return raw_data
 
@@ -655,8 +631,6 @@ def download_india_data() -> Dict[str, Any]:
     
     Returns raw data structure with metadata.
     """
-    print("Fetching India data (World Bank)...")
-    
     raw_data = {
         "fetch_timestamp": datetime.now(timezone.utc).isoformat(),
         "api_provider": "World Bank",
@@ -664,8 +638,8 @@ def download_india_data() -> Dict[str, Any]:
         "requests": []
     }
     
-    for indicator, config in INDIA_INDICATORS.items():
-        print(f"  - {indicator}...", end=" ", flush=True)
+    def fetch_indicator(item: Tuple[str, Dict]) -> Tuple[Dict, bool]:
+        indicator, config = item
         
         endpoint = f"{WORLD_BANK_BASE}/country/IN/indicator/{config['code']}"
         params = {
@@ -673,10 +647,17 @@ def download_india_data() -> Dict[str, Any]:
             "mrnev": 1  # Most recent non-empty value
         }
         
+        # World Bank indicators are annual, so cached responses keep for longer
+        cached = response_cache.get(endpoint, params, SLOW_SERIES_CACHE_TTL_HOURS) if response_cache else None
+        
         try:
-            response = requests.get(endpoint, params=params, timeout=30)
-            response.raise_for_status()
-            result = response.json()
+            if cached is not None:
+                result = cached
+            else:
+                with request_slots:
+                    response = SESSION.get(endpoint, params=params, timeout=30)
+                    response.raise_for_status()
+                    result = json.loads(response.content)
             success = True
             
             # World Bank returns [metadata, data] structure
@@ -702,6 +683,8 @@ def download_india_data() -> Dict[str, Any]:
                     raw_response=result
                 )
                 success = False
+            elif cached is None and response_cache:
+                response_cache.set(endpoint, params, result)
                 
         except requests.exceptions.RequestException as e:
             error_logger.log_error(
@@ -737,11 +720,19 @@ def download_india_data() -> Dict[str, Any]:
             "response": result
         }
         
+        return request_entry, success
+    
+    # Fetch indicators concurrently (at most WORLD_BANK_CONCURRENCY at a time,
+    # instead of a fixed pause between calls); results keep the series order
+    with ThreadPoolExecutor(max_workers=min(WORLD_BANK_CONCURRENCY, len(INDIA_INDICATORS))) as executor:
+        results = list(executor.map(fetch_indicator, INDIA_INDICATORS.items()))
+    
+    # Report in one write so countries fetched in parallel don't interleave
+    lines = ["Fetching India data (World Bank)..."]
+    for indicator, (request_entry, success) in zip(INDIA_INDICATORS, results):
         raw_data["requests"].append(request_entry)
-        print("✓" if success else "✗")
-        
-        # Small delay for World Bank (be nice to free API)
-        time.sleep(0.5)
+        lines.append(f"  - {indicator}... {'✓' if success else '✗'}")
+    print("\n".join(lines))
     
     return raw_data
 
@@ -750,27 +741,51 @@ def download_india_data() -> Dict[str, Any]:
 # DOWNLOAD ALL
 # =============================================================================
 
-def download_all(fred_key: str) -> Dict[str, Dict]:
+def save_raw_data(output_dir: Path, country: str, data: Dict) -> Path:
+    """Write one country's raw data to {country}_raw.json (compact; only machines read it)."""
+    output_file = output_dir / f"{country}_raw.json"
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'))
+    return output_file
+
+
+def load_raw_data(filepath: Path) -> Dict:
+    """Read a {country}_raw.json file written by save_raw_data."""
+    # json.loads decodes UTF-8 bytes itself, skipping the text-mode file layer
+    return json.loads(filepath.read_bytes())
+
+
+def download_all(fred_key: str, output_dir: Optional[Path] = None) -> Dict[str, Dict]:
     """
     Download data from all providers.
     
+    If output_dir is given, each country's raw file is written as soon as
+    that country finishes, while the others are still downloading.
+    
     Returns dict with raw data for each country.
     """
-    results = {}
-    
-    # USA - FRED
-    results["usa"] = download_usa_data(fred_key)
-    
-    # Canada - FRED
-    results["canada"] = download_canada_data(fred_key)
-    
-    # EU - FRED
-    results["eu"] = download_eu_data(fred_key)
-    
-    # India - World Bank (no key needed)
-    results["india"] = download_india_data()
+    def download(country: str, download_func, *args, **kwargs) -> Dict:
+        data = download_func(*args, **kwargs)
+        if output_dir is not None:
+            save_raw_data(output_dir, country, data)
+        return data
+    
+    # Countries are independent, so they are fetched in parallel; FRED calls
+    # still share fred_tracker's budget and the request slots
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {
+            # USA - FRED
+            "usa": executor.submit(download, "usa", download_fred_data, fred_key, "USA", USA_SERIES),
+            # Canada - FRED
+            "canada": executor.submit(download, "canada", download_fred_data, fred_key, "Canada", CANADA_SERIES),
+            # EU - FRED (Eurozone EA20)
+            "eu": executor.submit(download, "eu", download_fred_data, fred_key, "EU", EU_SERIES,
+                                  source="FRED - Eurozone EA20"),
+            # India - World Bank (no key needed)
+            "india": executor.submit(download, "india", download_india_data),
+        }
     
-    return results
+    return {country: future.result() for country, future in futures.items()}
 
 
 # =============================================================================
@@ -794,194 +809,68 @@ def extract_fred_value(observations: List, average_count: int = 1) -> Tuple[Opti
     values = []
     period = None
     
-    for i, obs in enumerate(observations):
-        if i >= average_count:
-            break
-        
+    # FRED marks missing observations (e.g. holidays in daily series) with "."
+    for obs in observations[:average_count]:
         value = obs.get("value", ".")
-        if value != ".":
-            try:
-                values.append(float(value))
-                if period is None:
-                    period = obs.get("date")
-            except (ValueError, TypeError):
-                continue
+        if value == ".":
+            continue
+        try:
+            values.append(float(value))
+        except (ValueError, TypeError):
+            continue
+        if period is None:
+            period = obs.get("date")
     
     if not values:
         return None, None
     
-    avg_value = sum(values) / len(values)
-    return round(avg_value, 2), period
-
+    return round(sum(values) / len(values), 2), period
 
-def calculate_usa_indicators(raw_data: Dict) -> Dict[str, Any]:
-    """
-    Calculate USA indicators from raw FRED data.
-    
-    All values use FRED transformations:
-    - GDP: pc1 (percent change from year ago)
-    - Inflation: pc1 (percent change from year ago)
-    - Unemployment: Average of last 2 months
-    - Interest Rate: Average of last month (~30 daily values)
-    """
-    indicators = {}
-    
-    for request in raw_data.get("requests", []):
-        if request.get("status") != "success":
-            continue
-        
-        indicator = request.get("indicator")
-        response = request.get("response", {})
-        observations = response.get("observations", [])
-        
-        if not observations:
-            continue
-        
-        try:
-            if indicator == "gdp":
-                value, period = extract_fred_value(observations, average_count=1)
-                if value is not None:
-                    indicators["gdp_growth"] = {
-                        "value": value,
-                        "unit": "percent",
-                        "period": period,
-                        "description": USA_SERIES['gdp']['description']
-                    }
-            
-            elif indicator == "inflation":
-                value, period = extract_fred_value(observations, average_count=1)
-                if value is not None:
-                    indicators["inflation"] = {
-                        "value": value,
-                        "unit": "percent",
-                        "period": period,
-                        "description": USA_SERIES['inflation']['description']
-                    }
-            
-            elif indicator == "unemployment":
-                # Average of last 2 months
-                value, period = extract_fred_value(observations, average_count=2)
-                if value is not None:
-                    indicators["unemployment"] = {
-                        "value": value,
-                        "unit": "percent",
-                        "period": period,
-                        "description": USA_SERIES['unemployment']['description']
-                    }
-            
-            elif indicator == "interest_rate":
-                # Average of last month (~30 daily values)
-                value, period = extract_fred_value(observations, average_count=30)
-                if value is not None:
-                    indicators["interest_rate"] = {
-                        "value": value,
-                        "unit": "percent",
-                        "period": period,
-                        "description": USA_SERIES['interest_rate']['description']
-                    }
-                    
-        except (ValueError, TypeError, KeyError) as e:
-            error_logger.log_error(
-                country="USA",
-                indicator=indicator,
-                endpoint="calculation",
-                parameters={},
-                error_type="CalculationError",
-                error_message=str(e),
-                raw_response=response,
-                stack_trace=traceback.format_exc()
-            )
-    
-    return indicators
 
+# FRED indicator -> (output key, observations averaged) per country.
+# GDP/inflation use the latest value of the transformed series; unemployment
+# averages the last 2 months and the USA rate the last ~30 daily values.
+FRED_CALC_SPEC = {
+    "usa": {
+        "gdp": ("gdp_growth", 1),
+        "inflation": ("inflation", 1),
+        "unemployment": ("unemployment", 2),
+        "interest_rate": ("interest_rate", 30)
+    },
+    "canada": {
+        "gdp": ("gdp_growth", 1),
+        "inflation": ("inflation", 1),
+        "unemployment": ("unemployment", 2),
+        "interest_rate": ("interest_rate", 1)
+    },
+    "eu": {
+        "gdp": ("gdp_growth", 1),
+        "inflation": ("inflation", 1),
+        "unemployment": ("unemployment", 2)
+    }
+}
 
-def calculate_canada_indicators(raw_data: Dict) -> Dict[str, Any]:
-    """
-    Calculate Canada indicators from raw FRED data.
-    
-    - GDP: pc1 transformation
-    - Inflation: Direct value (already percentage)
-    - Unemployment: Average of last 2 months
-    - Interest Rate: Direct value
-    """
-    indicators = {}
-    
-    for request in raw_data.get("requests", []):
-        if request.get("status") != "success":
-            continue
-        
-        indicator = request.get("indicator")
-        response = request.get("response", {})
-        observations = response.get("observations", [])
-        
-        if not observations:
-            continue
-        
-        try:
-            if indicator == "gdp":
-                value, period = extract_fred_value(observations, average_count=1)
-                if value is not None:
-                    indicators["gdp_growth"] = {
-                        "value": value,
-                        "unit": "percent",
-                        "period": period,
-                        "description": CANADA_SERIES['gdp']['description']
-                    }
-            
-            elif indicator == "inflation":
-                value, period = extract_fred_value(observations, average_count=1)
-                if value is not None:
-                    indicators["inflation"] = {
-                        "value": value,
-                        "unit": "percent",
-                        "period": period,
-                        "description": CANADA_SERIES['inflation']['description']
-                    }
-            
-            elif indicator == "unemployment":
-                # Average of last 2 months
-                value, period = extract_fred_value(observations, average_count=2)
-                if value is not None:
-                    indicators["unemployment"] = {
-                        "value": value,
-                        "unit": "percent",
-                        "period": period,
-                        "description": CANADA_SERIES['unemployment']['description']
-                    }
-            
-            elif indicator == "interest_rate":
-                value, period = extract_fred_value(observations, average_count=1)
-                if value is not None:
-                    indicators["interest_rate"] = {
-                        "value": value,
-                        "unit": "percent",
-                        "period": period,
-                        "description": CANADA_SERIES['interest_rate']['description']
-                    }
-                    
-        except (ValueError, TypeError, KeyError) as e:
-            error_logger.log_error(
-                country="Canada",
-                indicator=indicator,
-                endpoint="calculation",
-                parameters={},
-                error_type="CalculationError",
-                error_message=str(e),
-                raw_response=response,
-                stack_trace=traceback.format_exc()
-            )
-    
-    return indicators
+# FRED_CALC_SPEC with each indicator's description resolved once at import:
+# indicator -> (output key, observations averaged, description)
+FRED_CALC_PLAN = {
+    country: {
+        indicator: (output_key, average_count, series[indicator]['description'])
+        for indicator, (output_key, average_count) in FRED_CALC_SPEC[country].items()
+    }
+    for country, series in (("usa", USA_SERIES), ("canada", CANADA_SERIES), ("eu", EU_SERIES))
+}
 
 
-def calculate_eu_indicators(raw_data: Dict) -> Dict[str, Any]:
+def calculate_fred_indicators(raw_data: Dict, error_logger: ErrorLogger, country: str) -> Dict[str, Any]:
     """
-    Calculate EU indicators from raw FRED data.
+    Calculate a country's indicators from raw FRED data.
     
-    - GDP: pc1 transformation
-    - Inflation: pc1 transformation
-    - Unemployment: Average of last 2 months
+    Args:
+        raw_data: Raw data from download_fred_data
+        error_logger: Where calculation problems are logged
+        country: Country key in FRED_CALC_SPEC (usa, canada, eu)
     """
+    plan = FRED_CALC_PLAN[country]
     indicators = {}
     
     for request in raw_data.get("requests", []):
@@ -992,44 +881,36 @@ def calculate_eu_indicators(raw_data: Dict) -> Dict[str, Any]:
         response = request.get("response", {})
         observations = response.get("observations", [])
         
-        if not observations:
+        if not observations or indicator not in plan:
             continue
         
+        output_key, average_count, description = plan[indicator]
+        
         try:
-            if indicator == "gdp":
-                value, period = extract_fred_value(observations, average_count=1)
-                if value is not None:
-                    indicators["gdp_growth"] = {
-                        "value": value,
-                        "unit": "percent",
-                        "period": period,
-                        "description": EU_SERIES['gdp']['description']
-                    }
-            
-            elif indicator == "inflation":
-                value, period = extract_fred_value(observations, average_count=1)
-                if value is not None:
-                    indicators["inflation"] = {
-                        "value": value,
-                        "unit": "percent",
-                        "period": period,
-                        "description": EU_SERIES['inflation']['description']
-                    }
+            value, period = extract_fred_value(observations, average_count=average_count)
+            if value is None:
+                # Missing ('.') or unparseable values: one short entry, no dump
+                error_logger.log_error(
+                    country=raw_data.get("country", country),
+                    indicator=indicator,
+                    endpoint="calculation",
+                    parameters={},
+                    error_type="NoValidObservations",
+                    error_message=f"No numeric value in the latest {average_count} observation(s)",
+                    raw_response={"n_obs": len(observations)}
+                )
+                continue
             
-            elif indicator == "unemployment":
-                # Average of last 2 months
-                value, period = extract_fred_value(observations, average_count=2)
-                if value is not None:
-                    indicators["unemployment"] = {
-                        "value": value,
-                        "unit": "percent",
-                        "period": period,
-                        "description": EU_SERIES['unemployment']['description']
-                    }
+            indicators[output_key] = {
+                "value": value,
+                "unit": "percent",
+                "period": period,
+                "description": description
+            }
                     
         except (ValueError, TypeError, KeyError) as e:
             error_logger.log_error(
-                country="EU",
+                country=raw_data.get("country", country),
                 indicator=indicator,
                 endpoint="calculation",
                 parameters={},
@@ -1042,7 +923,7 @@ def calculate_eu_indicators(raw_data: Dict) -> Dict[str, Any]:
     return indicators
 
 
-def calculate_india_indicators(raw_data: Dict) -> Dict[str, Any]:
+def calculate_india_indicators(raw_data: Dict, error_logger: ErrorLogger) -> Dict[str, Any]:
     """
     Calculate India indicators from raw World Bank data.
     
@@ -1068,19 +949,18 @@ def calculate_india_indicators(raw_data: Dict) -> Dict[str, Any]:
         if not data_array:
             continue
         
+        description = INDIA_INDICATORS.get(indicator, {}).get('description', indicator)
+        
         try:
             # Get most recent non-null value (mrnev=1 should give us just one)
             for entry in data_array:
                 value = entry.get("value")
                 if value is not None:
-                    indicator_name = indicator
-                    config = INDIA_INDICATORS.get(indicator, {})
-                    
-                    indicators[indicator_name] = {
+                    indicators[indicator] = {
                         "value": round(float(value), 2),
                         "unit": "percent",
                         "period": entry.get("date"),
-                        "description": config.get('description', indicator)
+                        "description": description
                     }
                     break
                     
@@ -1099,45 +979,62 @@ def calculate_india_indicators(raw_data: Dict) -> Dict[str, Any]:
     return indicators
 
 
+# (thresholds, phrases) per indicator: a value above thresholds[i] (and not
+# above the next one) gets phrases[i + 1]; at or below the first, phrases[0]
+ECONOMIC_CONTEXT_BANDS = (
+    ("gdp_growth", (0, 2, 3),
+     ("Economic contraction", "Weak economic growth", "Moderate economic growth", "Strong economic growth")),
+    ("inflation", (2, 4),
+     ("low inflation", "moderate inflation", "elevated inflation")),
+    ("unemployment", (5, 7),
+     ("low unemployment", "moderate unemployment", "high unemployment")),
+)
+
+
 def generate_economic_context(indicators: Dict) -> str:
     """Generate economic context summary from indicators."""
-    gdp = indicators.get("gdp_growth", {}).get("value", 0)
-    inflation = indicators.get("inflation", {}).get("value", 0)
-    unemployment = indicators.get("unemployment", {}).get("value", 0)
-    
-    context_parts = []
-    
-    if gdp > 3:
-        context_parts.append("Strong economic growth")
-    elif gdp > 2:
-        context_parts.append("Moderate economic growth")
-    elif gdp > 0:
-        context_parts.append("Weak economic growth")
-    else:
-        context_parts.append("Economic contraction")
+    # bisect_left keeps the comparisons strict (a value equal to a threshold
+    # falls in the band below it)
+    context_parts = [
+        phrases[bisect_left(thresholds, indicators.get(name, {}).get("value", 0))]
+        for name, thresholds, phrases in ECONOMIC_CONTEXT_BANDS
+    ]
+    return ", ".join(context_parts) + "."
+
+
+def save_calculated_data(output_file: Path, calculated: Dict) -> bool:
+    """
+    Write a calculated file unless its content matches the last write.
     
-    if inflation > 4:
-        context_parts.append("elevated inflation")
-    elif inflation > 2:
-        context_parts.append("moderate inflation")
-    else:
-        context_parts.append("low inflation")
+    The timestamp is left out of the comparison, so an unchanged file keeps
+    the time its indicators last changed. A .sha256 sidecar holds the hash.
     
-    if unemployment > 7:
-        context_parts.append("high unemployment")
-    elif unemployment > 5:
-        context_parts.append("moderate unemployment")
-    else:
-        context_parts.append("low unemployment")
+    Returns:
+        True if the file was written
+    """
+    content = {k: v for k, v in calculated.items() if k != "timestamp"}
+    digest = hashlib.sha256(json.dumps(content, sort_keys=True).encode('utf-8')).hexdigest()
+    hash_file = output_file.with_suffix(".sha256")
     
-    return ", ".join(context_parts) + "."
+    try:
+        if output_file.exists() and hash_file.read_text(encoding='utf-8') == digest:
+            return False
+    except OSError:
+        pass  # No sidecar yet
+    
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(calculated, f, indent=2)
+    hash_file.write_text(digest, encoding='utf-8')
+    return True
 
 
-def calculate_and_validate(raw_data: Dict[str, Dict], output_dir: Path) -> Dict[str, Dict]:
+def calculate_and_validate(raw_data: Dict[str, Dict], output_dir: Path,
+                           error_logger: ErrorLogger) -> Dict[str, Dict]:
     """
     Process raw data and calculate indicators for all countries.
     
-    Saves calculated JSON files and returns results.
+    Saves calculated JSON files and returns results. Calculation problems
+    are logged to error_logger, which is passed down to each calculator.
     """
     print("\nCalculating indicators...")
     
@@ -1145,19 +1042,15 @@ def calculate_and_validate(raw_data: Dict[str, Dict], output_dir: Path) -> Dict[
     
     # Calculate for each country
     calculations = {
-        "usa": ("USA", "FRED", calculate_usa_indicators),
-        "canada": ("Canada", "FRED", calculate_canada_indicators),
-        "eu": ("EU", "FRED (Eurozone EA20)", calculate_eu_indicators),
+        "usa": ("USA", "FRED", partial(calculate_fred_indicators, country="usa")),
+        "canada": ("Canada", "FRED", partial(calculate_fred_indicators, country="canada")),
+        "eu": ("EU", "FRED (Eurozone EA20)", partial(calculate_fred_indicators, country="eu")),
         "india": ("India", "World Bank Open Data", calculate_india_indicators)
     }
     
-    for key, (country_name, data_source, calc_func) in calculations.items():
-        if key not in raw_data:
-            continue
-        
-        print(f"  - {country_name}...", end=" ", flush=True)
-        
-        indicators = calc_func(raw_data[key])
+    def calculate_country(key: str) -> Dict:
+        country_name, data_source, calc_func = calculations[key]
+        indicators = calc_func(raw_data[key], error_logger)
         
         calculated = {
             "country": country_name,
@@ -1167,13 +1060,17 @@ def calculate_and_validate(raw_data: Dict[str, Dict], output_dir: Path) -> Dict[
             "economic_context": generate_economic_context(indicators)
         }
         
-        # Save calculated file
-        output_file = output_dir / f"{key}_calculated.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(calculated, f, indent=2)
+        # Save calculated file (skipped when nothing but the timestamp changed)
+        save_calculated_data(output_dir / f"{key}_calculated.json", calculated)
         
-        results[key] = calculated
-        print(f"✓ ({len(indicators)} indicators)")
+        return calculated
+    
+    # Countries are calculated and saved in parallel; results keep table order
+    keys = [key for key in calculations if key in raw_data]
+    with ThreadPoolExecutor(max_workers=max(1, len(keys))) as executor:
+        for key, calculated in zip(keys, executor.map(calculate_country, keys)):
+            results[key] = calculated
+            print(f"  - {calculated['country']}... ✓ ({len(calculated['indicators'])} indicators)")
     
     return results
 
@@ -1182,9 +1079,25 @@ def calculate_and_validate(raw_data: Dict[str, Dict], output_dir: Path) -> Dict[
 # MAIN
 # =============================================================================
 
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Fetch macroeconomic data for all countries")
+    parser.add_argument('--max-concurrency', type=int, default=MAX_CONCURRENCY,
+                        help="Requests in flight at once: 0 = unlimited, 1 = serial, >1 = bounded "
+                             "(default: MACRO_MAX_CONCURRENCY or 6)")
+    parser.add_argument('--mode', choices=["prompt", "download", "cache", "auto"], default="prompt",
+                        help="prompt = ask whether to download (default), download = always fetch, "
+                             "cache = reuse existing raw files, auto = reuse them if younger than "
+                             "MACRO_CACHE_TTL_HOURS, else fetch")
+    return parser.parse_args()
+
+
 def main():
     """Main entry point."""
-    global error_logger
+    global error_logger, request_slots, response_cache
+    
+    args = parse_args()
+    request_slots = make_request_slots(args.max_concurrency)
     
     print("=" * 60)
     print("MACRO ECONOMIC DATA BATCH LOADER")
@@ -1218,6 +1131,10 @@ def main():
     # Initialize error logger
     error_logger = ErrorLogger(output_dir)
     
+    # Initialize response cache
+    if CACHE_TTL_HOURS > 0:
+        response_cache = ResponseCache(output_dir / ".cache", CACHE_TTL_HOURS)
+    
     # Load environment variables
     if not env_file.exists():
         print(f"\nERROR: .env file not found at {env_file}")
@@ -1246,29 +1163,32 @@ def main():
     if has_existing:
         print(f"\n  Existing raw files found in {output_dir}")
     
-    # Ask user whether to download or use existing
+    # Decide whether to download or use existing (asks unless --mode says)
     print("\n" + "-" * 60)
-    proceed = input("Download fresh data from APIs? (yes/no): ").strip().lower()
+    if args.mode == "prompt":
+        proceed = input("Download fresh data from APIs? (yes/no): ").strip().lower()
+    elif args.mode == "auto":
+        oldest = min(f.stat().st_mtime for f in existing_files.values()) if has_existing else 0
+        proceed = "no" if time.time() - oldest <= CACHE_TTL_HOURS * 3600 else "yes"
+        print(f"Mode auto: {'using existing raw files' if proceed == 'no' else 'downloading fresh data'}")
+    else:
+        proceed = "yes" if args.mode == "download" else "no"
     
     if proceed == "yes":
         print("\n" + "-" * 60)
         print("DOWNLOADING RAW DATA")
         print("-" * 60)
         
-        # Download all data
-        raw_data = download_all(fred_key)
+        # Download all data (raw files are saved as each country completes)
+        raw_data = download_all(fred_key, output_dir)
         
-        # Save raw data files
-        print("\nSaving raw data files...")
-        for country, data in raw_data.items():
-            output_file = output_dir / f"{country}_raw.json"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-            print(f"  - {output_file.name} ✓")
+        print("\nSaved raw data files:")
+        for country in raw_data:
+            print(f"  - {country}_raw.json ✓")
     
     elif proceed == "no":
         if not has_existing:
-            print("\nERROR: No existing raw files found. Please run with 'yes' first.")
+            print("\nERROR: No existing raw files found. Please download first ('yes' or --mode download).")
             return
         
         print("\n" + "-" * 60)
@@ -1279,8 +1199,7 @@ def main():
         raw_data = {}
         for country, filepath in existing_files.items():
             print(f"  Loading {filepath.name}...", end=" ", flush=True)
-            with open(filepath, 'r', encoding='utf-8') as f:
-                raw_data[country] = json.load(f)
+            raw_data[country] = load_raw_data(filepath)
             print("✓")
     
     else:
@@ -1292,7 +1211,7 @@ def main():
     print("-" * 60)
     
     # Calculate and validate
-    calculated_data = calculate_and_validate(raw_data, output_dir)
+    calculated_data = calculate_and_validate(raw_data, output_dir, error_logger)
     
     # Print summary
     print("\n" + "=" * 60, flush=True)
@@ -1328,4 +1247,8 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    try:
+        main()
+    finally:
+        if error_logger is not None:
+            error_logger.close()
\ No newline at end of file
@@ -16,8 +16,11 @@ Supports auto-select (1 representative stock per sector/country) or manual CSV i
 
 import os
 import logging
-import time
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
+from itertools import islice
 from typing import List, Dict, Tuple, Optional
 from pathlib import Path
 
@@ -38,6 +41,13 @@ CREDITS = {
     'recommendations_only': 100  # Just recommendations
 }
 
+# Sections of a sentiment document, in document order
+SENTIMENT_SECTIONS = ('analyst_ratings', 'recommendations', 'price_target')
+
+# Weighted recommendation score bands -> consensus label
+CONSENSUS_THRESHOLDS = (1.5, 2.5, 3.5, 4.5)
+CONSENSUS_LABELS = ('Strong Sell', 'Sell', 'Hold', 'Buy', 'Strong Buy')
+
 
 def fetch_sentiment_full(stock: Dict, client: TwelveDataClient) -> Dict:
     """
@@ -117,27 +127,26 @@ def parse_analyst_ratings(response: Dict) -> Optional[Dict]:
     
     ratings = data.get('ratings', [])
     
-    # Count rating changes
-    upgrade_count = sum(1 for r in ratings if r.get('rating_change') == 'Upgrade')
-    downgrade_count = sum(1 for r in ratings if r.get('rating_change') == 'Downgrade')
-    maintains_count = sum(1 for r in ratings if r.get('rating_change') == 'Maintains')
+    # Count rating changes in one pass
+    changes = Counter(r.get('rating_change') for r in ratings)
     
-    # Get recent ratings
-    recent_ratings = []
-    for r in ratings[:10]:  # Top 10 most recent
-        recent_ratings.append({
+    # Get recent ratings (top 10 most recent)
+    recent_ratings = [
+        {
             'date': r.get('date'),
             'firm': r.get('firm'),
             'rating_change': r.get('rating_change'),
             'rating_current': r.get('rating_current'),
             'rating_prior': r.get('rating_prior')
-        })
+        }
+        for r in islice(ratings, 10)
+    ]
     
     return {
         'total_ratings': len(ratings),
-        'upgrades': upgrade_count,
-        'downgrades': downgrade_count,
-        'maintains': maintains_count,
+        'upgrades': changes['Upgrade'],
+        'downgrades': changes['Downgrade'],
+        'maintains': changes['Maintains'],
         'recent_ratings': recent_ratings
     }
 
@@ -168,17 +177,8 @@ def parse_recommendations(response: Dict) -> Optional[Dict]:
         # Calculate weighted score (5=strong buy, 1=strong sell)
         score = (strong_buy * 5 + buy * 4 + hold * 3 + sell * 2 + strong_sell * 1) / total
         
-        # Determine consensus label
-        if score >= 4.5:
-            consensus = 'Strong Buy'
-        elif score >= 3.5:
-            consensus = 'Buy'
-        elif score >= 2.5:
-            consensus = 'Hold'
-        elif score >= 1.5:
-            consensus = 'Sell'
-        else:
-            consensus = 'Strong Sell'
+        # Determine consensus label (a score on a threshold takes the higher label)
+        consensus = CONSENSUS_LABELS[bisect_right(CONSENSUS_THRESHOLDS, score)]
     else:
         score = None
         consensus = 'No Data'
@@ -232,6 +232,8 @@ def build_sentiment_document(stock: Dict, sentiment_data: Dict) -> Dict:
     """
     Build the final sentiment document for Firestore.
     """
+    sections = {name: sentiment_data.get(name) for name in SENTIMENT_SECTIONS}
+    
     return {
         # Identity
         'symbol': stock['symbol'],
@@ -241,17 +243,11 @@ def build_sentiment_document(stock: Dict, sentiment_data: Dict) -> Dict:
         'sector': stock.get('sector', ''),
         
         # Sentiment data
-        'analyst_ratings': sentiment_data.get('analyst_ratings'),
-        'recommendations': sentiment_data.get('recommendations'),
-        'price_target': sentiment_data.get('price_target'),
+        **sections,
         
         # Flags
         'is_sector_representative': stock.get('is_representative', False),
-        'has_full_data': all([
-            sentiment_data.get('analyst_ratings'),
-            sentiment_data.get('recommendations'),
-            sentiment_data.get('price_target')
-        ]),
+        'has_full_data': all(sections.values()),
         
         # Metadata
         'fetched_at': datetime.now(timezone.utc).isoformat(),
@@ -283,11 +279,7 @@ def process_stock(stock: Dict, client: TwelveDataClient, mode: str) -> Tuple[Opt
         return None, credits_used
     
     # Check if we got any useful data
-    has_any_data = any([
-        sentiment_data.get('analyst_ratings'),
-        sentiment_data.get('recommendations'),
-        sentiment_data.get('price_target')
-    ])
+    has_any_data = any(sentiment_data.get(name) for name in SENTIMENT_SECTIONS)
     
     if not has_any_data:
         return None, credits_used
@@ -298,6 +290,58 @@ def process_stock(stock: Dict, client: TwelveDataClient, mode: str) -> Tuple[Opt
     return document, credits_used
 
 
+def run_stock(idx: int, total: int, stock: Dict, client: TwelveDataClient, mode: str,
+              config: BatchConfig, tracker: ProgressTracker, credit_tracker: CreditTracker,
+              credits_per_stock: int) -> bool:
+    """
+    Fetch, save and record one stock. Safe to call from worker threads.
+    
+    Returns:
+        True if the stock's sentiment was saved
+        
+    Raises:
+        RateLimitExceeded: The API refused further calls
+    """
+    symbol = stock['symbol']
+    
+    logger.info(f"\n[{idx}/{total}] Processing {symbol}")
+    
+    # Wait for and record credits atomically (shared with other workers)
+    credit_tracker.reserve_credits(credits_per_stock)
+    
+    try:
+        # Process stock
+        document, _ = process_stock(stock, client, mode)
+        
+        if document is None:
+            logger.warning(f"{symbol}: No sentiment data available")
+            tracker.mark_failed(symbol, "No data available", "no_data")
+            return False
+        
+        # Save to file
+        output_file = config.sentiment_dir / f"{symbol}.json"
+        save_json(document, output_file)
+        
+        tracker.mark_completed(symbol)
+        
+        consensus = document.get('recommendations', {})
+        if consensus:
+            consensus_label = consensus.get('consensus', 'N/A')
+            logger.info(f"{symbol}: Saved sentiment (Consensus: {consensus_label})")
+        else:
+            logger.info(f"{symbol}: Saved sentiment (partial data)")
+        
+        return True
+        
+    except RateLimitExceeded:
+        raise
+        
+    except Exception as e:
+        logger.error(f"Error processing {symbol}: {e}")
+        tracker.mark_failed(symbol, str(e), "error")
+        return False
+
+
 def main():
     print("="*70)
     print("SENTIMENT BATCH JOB - TWELVE DATA")
@@ -348,8 +392,9 @@ def main():
     tracker = ProgressTracker("sentiment", config.progress_dir)
     tracker.set_total(len(stocks))
     
-    # Filter already completed
-    remaining = [s for s in stocks if not tracker.is_completed(s['symbol'])]
+    # Filter already completed (one snapshot instead of a locked lookup per stock)
+    completed = tracker.completed_items()
+    remaining = [s for s in stocks if s['symbol'] not in completed]
     
     print(f"\nProcessing Configuration:")
     print(f"  Total stocks: {len(stocks)}")
@@ -368,67 +413,45 @@ def main():
         print("Aborted")
         return
     
-    # Process stocks
+    # Process stocks concurrently: as many in flight as one minute of credits allows
     total_success = 0
     total_failed = 0
+    # One worker per stock that fits in a credit window, plus one extra that
+    # waits for the next window while the others are still in flight
+    max_concurrent = max(1, config.td_credits_per_minute // credits_per_stock) + 1
+    print(f"  Concurrent stocks: {max_concurrent}")
+    
+    executor = ThreadPoolExecutor(max_workers=max_concurrent)
+    futures = [
+        executor.submit(
+            run_stock, idx, len(remaining), stock, client, mode,
+            config, tracker, credit_tracker, credits_per_stock
+        )
+        for idx, stock in enumerate(remaining, 1)
+    ]
     
-    for idx, stock in enumerate(remaining, 1):
-        symbol = stock['symbol']
-        
-        logger.info(f"\n[{idx}/{len(remaining)}] Processing {symbol}")
-        
-        # Wait for credits
-        credit_tracker.wait_for_credits(credits_per_stock)
-        
-        try:
-            # Process stock
-            document, credits_used = process_stock(stock, client, mode)
-            
-            # Record credit usage
-            credit_tracker.use_credits(credits_used)
-            
-            if document is None:
-                logger.warning(f"{symbol}: No sentiment data available")
-                tracker.mark_failed(symbol, "No data available", "no_data")
-                total_failed += 1
-            else:
-                # Save to file
-                output_file = config.sentiment_dir / f"{symbol}.json"
-                save_json(document, output_file)
-                
-                tracker.mark_completed(symbol)
+    try:
+        for done, future in enumerate(as_completed(futures), 1):
+            if future.result():
                 total_success += 1
-                
-                consensus = document.get('recommendations', {})
-                if consensus:
-                    consensus_label = consensus.get('consensus', 'N/A')
-                    logger.info(f"{symbol}: Saved sentiment (Consensus: {consensus_label})")
-                else:
-                    logger.info(f"{symbol}: Saved sentiment (partial data)")
+            else:
+                total_failed += 1
             
             # Progress update
-            if idx % 5 == 0:
+            if done % 5 == 0:
                 print(f"\nProgress: {tracker.get_summary()}")
                 print(credit_tracker.get_summary())
-            
-            # Small delay between requests
-            if idx < len(remaining):
-                time.sleep(1)
                 
-        except RateLimitExceeded as e:
-            logger.error(f"Rate limit exceeded: {e}")
-            tracker.mark_rate_limit_reached()
-            print("\n" + "="*70)
-            print("API RATE LIMIT REACHED")
-            print("="*70)
-            print("Progress saved. Run again to resume.")
-            break
-            
-        except Exception as e:
-            logger.error(f"Error processing {symbol}: {e}")
-            tracker.mark_failed(symbol, str(e), "error")
-            total_failed += 1
-            continue
+    except RateLimitExceeded as e:
+        executor.shutdown(wait=False, cancel_futures=True)
+        logger.error(f"Rate limit exceeded: {e}")
+        tracker.mark_rate_limit_reached()
+        print("\n" + "="*70)
+        print("API RATE LIMIT REACHED")
+        print("="*70)
+        print("Progress saved. Run again to resume.")
+    
+    executor.shutdown()
     
     # Final summary
     print("\n" + "="*70)
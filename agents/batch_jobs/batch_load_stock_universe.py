@@ -6,25 +6,34 @@ No API calls - just data organization.
 
 import csv
 import logging
+import sys
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from batch_utils import BatchConfig, ProgressTracker, save_json, setup_logging
 
 logger = logging.getLogger(__name__)
 
+# Threads writing sector files in parallel
+UNIVERSE_WRITE_WORKERS = 8
+
 
 def load_seeds_from_csv(csv_path: str = "./stock_universe_seeds.csv"):
-    """Load stock seeds from CSV file."""
+    """
+    Load stock seeds from CSV file.
+    Repeated category values (country, sector, tier, exchange) are interned
+    so every row shares one string object per distinct value.
+    """
     stocks_by_country_sector = defaultdict(list)
     
-    with open(csv_path, 'r') as f:
+    with open(csv_path, 'r', newline='') as f:
         reader = csv.DictReader(f)
         for row in reader:
-            key = (row['country'], row['sector'])
+            key = (sys.intern(row['country']), sys.intern(row['sector']))
             stocks_by_country_sector[key].append({
                 'symbol': row['symbol'],
                 'name': row['name'],
-                'market_cap_tier': row['market_cap_tier'],
-                'exchange': row['exchange']  # Added exchange field
+                'market_cap_tier': sys.intern(row['market_cap_tier']),
+                'exchange': sys.intern(row['exchange'])  # Added exchange field
             })
     
     return stocks_by_country_sector
@@ -51,46 +60,57 @@ def main():
     tracker = ProgressTracker("stock_universe", config.progress_dir)
     tracker.set_total(total_combinations)
     
-    # Process each country-sector combination
+    # Process each country-sector combination present in the seeds; the
+    # configured combinations with no seeds are recorded in one pass below
+    expected = {(country, sector) for country in config.countries for sector in config.sectors}
     processed_count = 0
     
-    for country in config.countries:
-        for sector in config.sectors:
-            item_id = f"{country}_{sector}"
-            
-            # Skip if already processed
-            if tracker.is_completed(item_id):
-                logger.info(f"Skipping {item_id} (already processed)")
-                continue
-            
-            # Get stocks for this combination
-            key = (country, sector)
-            stocks = stocks_by_country_sector.get(key, [])
-            
-            # Limit to configured count
-            stocks = stocks[:config.stocks_per_sector]
-            
-            if not stocks:
-                logger.warning(f"No stocks found for {country}/{sector}")
-                tracker.mark_failed(item_id, "No stocks in seeds CSV")
-                continue
-            
-            # Create output document
-            document = {
-                'country': country,
-                'sector': sector,
-                'stocks': stocks,
-                'stock_count': len(stocks),
-                'last_updated': None  # Will be set during Firestore upload
-            }
-            
-            # Save to JSON
-            output_file = config.universe_dir / f"{country}_{sector}.json"
-            save_json(document, output_file)
-            
-            logger.info(f"Created {item_id}: {len(stocks)} stocks")
-            tracker.mark_completed(item_id)
-            processed_count += 1
+    # Files are written in the background; items are marked completed once saved
+    executor = ThreadPoolExecutor(max_workers=UNIVERSE_WRITE_WORKERS)
+    pending_writes = []
+    
+    for (country, sector), stocks in stocks_by_country_sector.items():
+        if (country, sector) not in expected:
+            continue
+        
+        item_id = f"{country}_{sector}"
+        
+        # Skip if already processed
+        if tracker.is_completed(item_id):
+            logger.info(f"Skipping {item_id} (already processed)")
+            continue
+        
+        # Limit to configured count
+        stocks = stocks[:config.stocks_per_sector]
+        
+        if not stocks:
+            logger.warning(f"No stocks found for {country}/{sector}")
+            tracker.mark_failed(item_id, "No stocks in seeds CSV")
+            continue
+        
+        # Create output document
+        document = {
+            'country': country,
+            'sector': sector,
+            'stocks': stocks,
+            'stock_count': len(stocks),
+            'last_updated': None  # Will be set during Firestore upload
+        }
+        
+        # Save to JSON
+        output_file = config.universe_dir / f"{country}_{sector}.json"
+        pending_writes.append((item_id, len(stocks), executor.submit(save_json, document, output_file)))
+    
+    for item_id, stock_count, future in pending_writes:
+        future.result()
+        logger.info(f"Created {item_id}: {stock_count} stocks")
+        tracker.mark_completed(item_id)
+        processed_count += 1
+    executor.shutdown()
+    
+    for country, sector in sorted(expected - stocks_by_country_sector.keys()):
+        logger.warning(f"No stocks found for {country}/{sector}")
+        tracker.mark_failed(f"{country}_{sector}", "No stocks in seeds CSV")
     
     # Summary
     print("\n" + "="*70)
@@ -9,11 +9,13 @@ import json
 import os
 import re
 import logging
+import threading
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 import yaml
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
 # Load environment variables from .env file (parent directory)
@@ -24,8 +26,14 @@ logger = logging.getLogger(__name__)
 
 
 class RateLimitExceeded(Exception):
-    """Exception raised when API rate limit is hit."""
-    pass
+    """
+    Exception raised when API rate limit is hit.
+    retry_after is set (in seconds) when the API said when to try again
+    via a Retry-After header; otherwise the limit should be treated as final.
+    """
+    def __init__(self, message: str = "", retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
 
 
 class InsufficientCredits(Exception):
@@ -54,6 +62,7 @@ class BatchConfig:
         self.td_timeout = td_config['timeout']
         self.td_enable_realtime = td_config['enable_realtime_api_calls']
         self.td_credits = td_config['credits']
+        self.td_statistics_cache_ttl_hours = td_config.get('statistics_cache_ttl_hours', 24)
         
         # Sentiment settings (if present)
         if 'sentiment' in self.config:
@@ -70,6 +79,8 @@ class BatchConfig:
         self.fundamentals_dir = Path(self.config['output']['fundamentals'])
         self.sentiment_dir = Path(self.config['output']['sentiment'])
         self.progress_dir = Path(self.config['output']['progress'])
+        self.statistics_cache_dir = Path(self.config['output'].get('statistics_cache',
+                                                                   'batch_output/statistics_cache'))
         
         # Firestore collections
         self.firestore_collections = self.config['firestore']['collections']
@@ -80,7 +91,7 @@ class BatchConfig:
     def _create_directories(self):
         """Create output directories if they don't exist."""
         for directory in [self.base_dir, self.universe_dir, self.fundamentals_dir,
-                         self.sentiment_dir, self.progress_dir]:
+                         self.sentiment_dir, self.progress_dir, self.statistics_cache_dir]:
             directory.mkdir(parents=True, exist_ok=True)
         logger.info(f"Output directories ready in: {self.base_dir}")
     
@@ -96,9 +107,11 @@ class CreditTracker:
     """
     Track API credit usage to stay within rate limits.
     Implements per-minute tracking with automatic wait when limit approached.
+    Thread-safe: concurrent workers should use reserve_credits().
     """
     
     def __init__(self, progress_dir: Path, credits_per_minute: int = 610):
+        self._lock = threading.RLock()
         self.credits_per_minute = credits_per_minute
         self.tracking_file = progress_dir / "credit_tracking.json"
         self.credits_used_this_minute = 0
@@ -120,54 +133,98 @@ class CreditTracker:
         self._reset_if_new_minute()
         return (self.credits_used_this_minute + credits_needed) <= self.credits_per_minute
     
-    def wait_for_credits(self, credits_needed: int):
-        """Wait until enough credits are available (minute reset)."""
+    def _seconds_until_available(self, credits_needed: int) -> float:
+        """
+        Seconds to wait before credits_needed fits in the window (0 if it fits now).
+        Caller must hold the lock.
+        """
         self._reset_if_new_minute()
         
-        if self.can_use_credits(credits_needed):
-            return
+        # A request larger than a whole minute's budget can only go into an empty window
+        if self.can_use_credits(credits_needed) or self.credits_used_this_minute == 0:
+            return 0
         
-        # Calculate wait time
         now = datetime.now(timezone.utc)
         elapsed = (now - self.minute_start_time).total_seconds()
-        wait_seconds = max(0, 61 - elapsed)  # Wait until next minute + 1 second buffer
-        
-        if wait_seconds > 0:
-            logger.info(f"Credit limit approaching! Used: {self.credits_used_this_minute}/{self.credits_per_minute}")
-            logger.info(f"Waiting {wait_seconds:.0f} seconds for rate limit reset...")
+        wait_seconds = max(1, 61 - elapsed)  # Wait until next minute + 1 second buffer
+        logger.info(f"Credit limit approaching! Used: {self.credits_used_this_minute}/{self.credits_per_minute}")
+        logger.info(f"Waiting {wait_seconds:.0f} seconds for rate limit reset...")
+        return wait_seconds
+    
+    def wait_for_credits(self, credits_needed: int):
+        """
+        Wait until enough credits are available (minute reset).
+        The lock is released while sleeping, so other workers are not blocked.
+        """
+        while True:
+            with self._lock:
+                wait_seconds = self._seconds_until_available(credits_needed)
+            if wait_seconds <= 0:
+                return
             print(f"\n  ⏳ Rate limit: Waiting {wait_seconds:.0f}s for credit reset...")
             time.sleep(wait_seconds)
-        
-        # Reset after waiting
-        self.credits_used_this_minute = 0
-        self.minute_start_time = datetime.now(timezone.utc)
     
     def use_credits(self, credits: int):
         """Record credit usage."""
-        self._reset_if_new_minute()
-        self.credits_used_this_minute += credits
-        self.total_session_credits += credits
+        with self._lock:
+            self._reset_if_new_minute()
+            self.credits_used_this_minute += credits
+            self.total_session_credits += credits
         logger.debug(f"Used {credits} credits. Minute: {self.credits_used_this_minute}/{self.credits_per_minute}")
     
+    def reserve_credits(self, credits_needed: int):
+        """
+        Wait for and record credits in one atomic step.
+        Use this instead of wait_for_credits() + use_credits() when several
+        threads share the tracker, so they cannot overspend the same minute.
+        """
+        while True:
+            # Re-check after every sleep: another worker may have taken the credits
+            with self._lock:
+                wait_seconds = self._seconds_until_available(credits_needed)
+                if wait_seconds <= 0:
+                    self.use_credits(credits_needed)
+                    return
+            print(f"\n  ⏳ Rate limit: Waiting {wait_seconds:.0f}s for credit reset...")
+            time.sleep(wait_seconds)
+    
     def get_available_credits(self) -> int:
         """Get remaining credits for this minute."""
         self._reset_if_new_minute()
         return self.credits_per_minute - self.credits_used_this_minute
     
+    def suggest_delay(self, max_delay: float = 2.0, headroom: float = 0.2) -> float:
+        """
+        Suggest a courtesy pause between batches based on the remaining budget.
+        Returns 0 while at least `headroom` of this minute's credits are left,
+        then scales up linearly to max_delay as the budget runs out.
+        """
+        with self._lock:
+            available = self.get_available_credits()
+        threshold = self.credits_per_minute * headroom
+        if available >= threshold:
+            return 0.0
+        return max_delay * (1 - max(0, available) / threshold)
+    
     def force_wait_for_reset(self):
         """Force wait until the next minute, regardless of credit usage.
-        Use this when rate limit errors are detected in responses."""
-        now = datetime.now(timezone.utc)
-        elapsed = (now - self.minute_start_time).total_seconds()
-        wait_seconds = max(5, 62 - elapsed)  # At least 5 seconds, up to 62 seconds
-        
-        logger.info(f"Force waiting {wait_seconds:.0f} seconds for rate limit reset...")
+        Use this when rate limit errors are detected in responses.
+        The window is closed for every worker until the reset, but the lock
+        is not held while sleeping."""
+        with self._lock:
+            now = datetime.now(timezone.utc)
+            elapsed = (now - self.minute_start_time).total_seconds()
+            wait_seconds = max(5, 62 - elapsed)  # At least 5 seconds, up to 62 seconds
+            
+            # Exhaust the current window and make it end after the wait, so
+            # reserve_credits() holds other workers back until the reset
+            reset_at = now + timedelta(seconds=wait_seconds)
+            self.minute_start_time = max(self.minute_start_time, reset_at - timedelta(seconds=60))
+            self.credits_used_this_minute = self.credits_per_minute
+            
+            logger.info(f"Force waiting {wait_seconds:.0f} seconds for rate limit reset...")
         print(f"\n  ⏳ Rate limit hit: Force waiting {wait_seconds:.0f}s for credit reset...")
         time.sleep(wait_seconds)
-        
-        # Reset after waiting
-        self.credits_used_this_minute = 0
-        self.minute_start_time = datetime.now(timezone.utc)
     
     def get_summary(self) -> str:
         """Get credit usage summary."""
@@ -176,9 +233,10 @@ class CreditTracker:
 
 
 class ProgressTracker:
-    """Track and resume batch job progress."""
+    """Track and resume batch job progress. Safe to update from multiple threads."""
     
     def __init__(self, job_name: str, progress_dir: Path):
+        self._lock = threading.RLock()
         self.job_name = job_name
         self.progress_file = progress_dir / f"{job_name}_progress.json"
         self.progress = self._load_progress()
@@ -206,34 +264,42 @@ class ProgressTracker:
     
     def mark_completed(self, item_id: str):
         """Mark item as completed."""
-        if item_id not in self.progress['processed_items']:
-            self.progress['processed_items'].append(item_id)
-            self.progress['completed'] = len(self.progress['processed_items'])
-            self.progress['last_updated'] = datetime.now(timezone.utc).isoformat()
-            self._save()
+        with self._lock:
+            if item_id not in self.progress['processed_items']:
+                self.progress['processed_items'].append(item_id)
+                self.progress['completed'] = len(self.progress['processed_items'])
+                self.progress['last_updated'] = datetime.now(timezone.utc).isoformat()
+                self._save()
     
     def mark_failed(self, item_id: str, error: str, error_type: str = "unknown"):
         """Mark item as failed with error type."""
-        existing = [f for f in self.progress['failed_items'] if f['item_id'] == item_id]
-        if not existing:
-            self.progress['failed_items'].append({
-                'item_id': item_id,
-                'error': error,
-                'error_type': error_type,
-                'timestamp': datetime.now(timezone.utc).isoformat()
-            })
-            self._save()
+        with self._lock:
+            existing = [f for f in self.progress['failed_items'] if f['item_id'] == item_id]
+            if not existing:
+                self.progress['failed_items'].append({
+                    'item_id': item_id,
+                    'error': error,
+                    'error_type': error_type,
+                    'timestamp': datetime.now(timezone.utc).isoformat()
+                })
+                self._save()
     
     def mark_rate_limit_reached(self):
         """Mark that rate limit was reached."""
-        self.progress['rate_limit_reached'] = True
-        self.progress['rate_limit_timestamp'] = datetime.now(timezone.utc).isoformat()
-        self._save()
+        with self._lock:
+            self.progress['rate_limit_reached'] = True
+            self.progress['rate_limit_timestamp'] = datetime.now(timezone.utc).isoformat()
+            self._save()
     
     def is_completed(self, item_id: str) -> bool:
         """Check if item already processed."""
         return item_id in self.progress['processed_items']
     
+    def completed_items(self) -> frozenset:
+        """Snapshot of processed item IDs for fast membership checks."""
+        with self._lock:
+            return frozenset(self.progress['processed_items'])
+    
     def get_remaining_count(self) -> int:
         """Get count of remaining items."""
         return self.progress['total'] - self.progress['completed']
@@ -244,7 +310,7 @@ class ProgressTracker:
     
     def _save(self):
         """Save progress to file."""
-        with open(self.progress_file, 'w') as f:
+        with self._lock, open(self.progress_file, 'w') as f:
             json.dump(self.progress, f, indent=2)
     
     def get_summary(self) -> str:
@@ -295,6 +361,9 @@ class TwelveDataClient:
     BASE_URL = "https://api.twelvedata.com"
     BATCH_URL = f"{BASE_URL}/batch"
     
+    # Pooled keep-alive connections, enough for concurrent batch workers
+    POOL_SIZE = 16
+    
     def __init__(self, api_key: str, timeout: int = 60):
         self.api_key = api_key
         self.timeout = timeout
@@ -302,16 +371,45 @@ class TwelveDataClient:
             "Content-Type": "application/json",
             "Authorization": f"apikey {api_key}"
         }
+        # One session for the whole job so TLS connections are reused across batches
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.POOL_SIZE)
+        self.session.mount("https://", adapter)
+        self._urls: Dict[Tuple[str, str, Optional[str]], str] = {}
     
-    def build_statistics_url(self, symbol: str, exchange: str = None) -> str:
+    def _build_url(self, endpoint: str, symbol: str, exchange: str = None) -> str:
         """
-        Build URL for statistics endpoint.
+        Build a per-symbol endpoint URL for use in a batch request.
         Uses mic_code for international stocks (not exchange).
+        URLs are memoized per (endpoint, symbol, exchange) so retries and
+        reruns reuse them.
         """
-        if exchange and exchange.strip():
-            # Use mic_code parameter for international stocks
-            return f"/statistics?symbol={symbol}&mic_code={exchange}&apikey={self.api_key}"
-        return f"/statistics?symbol={symbol}&apikey={self.api_key}"
+        key = (endpoint, symbol, exchange)
+        url = self._urls.get(key)
+        if url is None:
+            if exchange and exchange.strip():
+                # Use mic_code parameter for international stocks
+                url = f"{endpoint}?symbol={symbol}&mic_code={exchange}&apikey={self.api_key}"
+            else:
+                url = f"{endpoint}?symbol={symbol}&apikey={self.api_key}"
+            self._urls[key] = url
+        return url
+    
+    def build_statistics_url(self, symbol: str, exchange: str = None) -> str:
+        """Build URL for statistics endpoint."""
+        return self._build_url("/statistics", symbol, exchange)
+    
+    def build_analyst_ratings_url(self, symbol: str, exchange: str = None) -> str:
+        """Build URL for analyst ratings (light) endpoint."""
+        return self._build_url("/analyst_ratings/light", symbol, exchange)
+    
+    def build_recommendations_url(self, symbol: str, exchange: str = None) -> str:
+        """Build URL for recommendations endpoint."""
+        return self._build_url("/recommendations", symbol, exchange)
+    
+    def build_price_target_url(self, symbol: str, exchange: str = None) -> str:
+        """Build URL for price target endpoint."""
+        return self._build_url("/price_target", symbol, exchange)
     
     def sanitize_json_response(self, raw_text: str) -> str:
         """
@@ -374,13 +472,20 @@ class TwelveDataClient:
             logger.debug(f"Executing batch with {len(requests_dict)} requests")
             
             # Use stream=False and explicit encoding handling
-            response = requests.post(
+            response = self.session.post(
                 self.BATCH_URL,
                 headers=self.headers,
                 json=requests_dict,
                 timeout=self.timeout,
                 stream=False
             )
+            
+            # On 429, honor Retry-After (seconds form) so callers can wait exactly that long
+            if response.status_code == 429:
+                retry_after = response.headers.get('Retry-After', '')
+                if retry_after.strip().isdigit():
+                    logger.warning(f"Batch rate limited (HTTP 429), retry after {retry_after}s")
+                    raise RateLimitExceeded("HTTP 429 Too Many Requests", retry_after=float(retry_after))
             response.raise_for_status()
             
             # Force UTF-8 encoding for response
@@ -462,7 +567,7 @@ class TwelveDataClient:
             params = params or {}
             params['apikey'] = self.api_key
             
-            response = requests.get(url, params=params, timeout=self.timeout)
+            response = self.session.get(url, params=params, timeout=self.timeout)
             response.raise_for_status()
             
             # Handle potential string response
@@ -524,12 +629,11 @@ def save_json(data: Any, filepath: Path, pretty: bool = True):
     # Ensure parent directory exists
     filepath.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(filepath, 'w', encoding='utf-8') as f:
-        if pretty:
-            json.dump(data, f, indent=2, default=str)
-        else:
-            json.dump(data, f, default=str)
-    logger.debug(f"Saved: {filepath}")
+    # Serialize in one go and write once; json.dump would issue a write()
+    # per encoder chunk. Compact output also lets json use its C encoder.
+    text = json.dumps(data, indent=2 if pretty else None, default=str)
+    filepath.write_text(text, encoding='utf-8')
+    logger.debug("Saved: %s", filepath)
 
 
 def load_json(filepath: Path) -> Optional[Any]:
@@ -18,7 +18,9 @@ class AgentConfig(BaseSettings):
     # Anthropic API
     anthropic_api_key: str = Field(..., min_length=20, description="Anthropic API key")
     anthropic_model: str = Field(default="claude-sonnet-4-20250514", description="Claude model to use")
+    anthropic_planner_model: str = Field(default="claude-haiku-4-5", description="Faster Claude model for tool-gathering turns")
     anthropic_max_tokens: int = Field(default=4096, ge=1, le=8192, description="Max tokens for Claude response")
+    anthropic_planner_max_tokens: int = Field(default=1024, ge=1, le=8192, description="Max tokens for tool-gathering turns when a separate composer model is used")
     anthropic_temperature: float = Field(default=0.7, ge=0.0, le=1.0, description="Temperature for Claude creativity")
 
     # External API Keys
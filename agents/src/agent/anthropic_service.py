@@ -4,10 +4,13 @@ Phase 3: Implements agent loop with function calling and real APIs.
 """
 
 from anthropic import Anthropic, APIError, APIConnectionError, RateLimitError
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Callable, Optional
+import httpx
 import json
 import logging
 from config import config
+from .clients import get_anthropic_client
 from .tools.tool_registry import ToolRegistry
 from .prompts.system_prompt import get_system_prompt
 
@@ -19,21 +22,39 @@ logger = logging.getLogger(__name__)
 class AnthropicService:
     """Service for interacting with Anthropic Claude API with tool support."""
     
-    def __init__(self, alpha_vantage_key: str, fred_key: str):
+    def __init__(
+        self,
+        alpha_vantage_key: str,
+        fred_key: str,
+        planner_model: Optional[str] = None,
+        composer_model: Optional[str] = None,
+        http_client: Optional[httpx.Client] = None
+    ):
         """
         Initialize Anthropic client with tool support.
         
         Args:
             alpha_vantage_key: Alpha Vantage API key for macro data
             fred_key: FRED API key for Canada/EU macro data
+            planner_model: Model for tool-gathering turns (default: config.anthropic_planner_model)
+            composer_model: Model for the final portfolio answer (default: config.anthropic_model)
+            http_client: Optional dedicated HTTP client. By default the
+                process-wide client from clients.get_anthropic_client() is
+                used, so connections are reused across service instances.
         """
-        self.client = Anthropic(
-            api_key=config.anthropic_api_key,
-            max_retries=config.max_retries,
-            timeout=30.0
-        )
-        self.model = config.anthropic_model
+        if http_client is None:
+            self.client = get_anthropic_client()
+        else:
+            self.client = Anthropic(
+                api_key=config.anthropic_api_key,
+                max_retries=config.max_retries,
+                timeout=30.0,
+                http_client=http_client
+            )
+        self.planner_model = planner_model or config.anthropic_planner_model
+        self.composer_model = composer_model or config.anthropic_model
         self.max_tokens = config.anthropic_max_tokens
+        self.planner_max_tokens = config.anthropic_planner_max_tokens
         self.temperature = config.anthropic_temperature
         
         # Initialize tool registry with API keys
@@ -46,7 +67,8 @@ class AnthropicService:
         investment_horizon_years: int,
         country: str,
         investment_amount: float,
-        currency: str
+        currency: str,
+        on_text: Optional[Callable[[str], None]] = None
     ) -> Dict[str, Any]:
         """
         Generate portfolio recommendations using Claude API with tools.
@@ -57,6 +79,8 @@ class AnthropicService:
             country: Country for stock selection (USA, Canada, EU, India)
             investment_amount: Amount to invest
             currency: Currency code
+            on_text: Optional callback receiving streamed text deltas as
+                Claude generates them (for progress display)
             
         Returns:
             Portfolio recommendation dictionary matching PortfolioRecommendationDto
@@ -87,7 +111,8 @@ class AnthropicService:
                 messages=messages,
                 system_prompt=system_prompt,
                 investment_amount=investment_amount,
-                investment_horizon_years=investment_horizon_years
+                investment_horizon_years=investment_horizon_years,
+                on_text=on_text
             )
             
             logger.info(f"Successfully generated portfolio with {len(portfolio['recommendations'])} stocks")
@@ -112,18 +137,25 @@ class AnthropicService:
         system_prompt: str,
         investment_amount: float,
         investment_horizon_years: int,
-        max_iterations: int = 5
+        max_iterations: int = 5,
+        on_text: Optional[Callable[[str], None]] = None
     ) -> Dict[str, Any]:
         """
         Execute the agent loop: send message → check tools → execute → repeat.
         
         This is the core agentic pattern:
-        1. Send messages to Claude with available tools
+        1. Send messages to the planner model with available tools
         2. Claude responds with either:
            - Final answer (stop_reason: "end_turn")
            - Tool use request (stop_reason: "tool_use")
         3. If tool use, execute tools and add results to conversation
-        4. Repeat until Claude provides final answer or max iterations reached
+        4. Repeat until Claude stops requesting tools or max iterations reached
+        
+        If the planner and composer models differ, planner turns are capped
+        at planner_max_tokens and not streamed to on_text: as soon as the
+        planner stops requesting tools its reply is dropped and the composer
+        writes the final portfolio from the gathered tool results, so the
+        answer is generated (and streamed) only once.
         
         Args:
             messages: Conversation messages (list of dicts)
@@ -131,6 +163,7 @@ class AnthropicService:
             investment_amount: Initial investment amount
             investment_horizon_years: Investment time horizon
             max_iterations: Maximum loop iterations (prevents infinite loops)
+            on_text: Optional callback receiving streamed text deltas
             
         Returns:
             Final portfolio dictionary
@@ -138,16 +171,18 @@ class AnthropicService:
         Raises:
             RuntimeError: If max iterations exceeded without completion
         """
+        use_composer = self.composer_model != self.planner_model
         iteration = 0
         
         while iteration < max_iterations:
             iteration += 1
             logger.info(f"Agent loop iteration {iteration}/{max_iterations}")
             
-            # Call Claude API with tools
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=self.max_tokens,
+            # Call Claude API with tools (planner model gathers data)
+            response = self._create_message(
+                on_text=None if use_composer else on_text,
+                model=self.planner_model,
+                max_tokens=self.planner_max_tokens if use_composer else self.max_tokens,
                 temperature=self.temperature,
                 system=system_prompt,
                 messages=messages,
@@ -157,12 +192,7 @@ class AnthropicService:
             logger.info(f"Claude response - Stop reason: {response.stop_reason}, Content blocks: {len(response.content)}")
             
             # Check stop reason
-            if response.stop_reason == "end_turn":
-                # Claude finished without requesting tools - extract final portfolio
-                logger.info("Claude finished with final answer")
-                return self._extract_final_portfolio(response, investment_amount, investment_horizon_years)
-            
-            elif response.stop_reason == "tool_use":
+            if response.stop_reason == "tool_use":
                 # Claude wants to use tools
                 logger.info("Claude requested tool usage")
                 
@@ -184,22 +214,86 @@ class AnthropicService:
                 # Continue loop - Claude will process tool results and decide next action
                 continue
             
+            if response.stop_reason == "end_turn":
+                # Claude finished without requesting tools - extract final portfolio
+                logger.info("Claude finished gathering data")
             else:
                 # Unexpected stop reason - try to extract answer anyway
                 logger.warning(f"Unexpected stop reason: {response.stop_reason}")
-                return self._extract_final_portfolio(response, investment_amount, investment_horizon_years)
+            
+            if use_composer:
+                response = self._compose_final_answer(messages, system_prompt, on_text)
+            return self._extract_final_portfolio(response, investment_amount, investment_horizon_years)
         
         # Max iterations reached without completion
         logger.error(f"Agent loop exceeded maximum iterations ({max_iterations})")
         raise RuntimeError(f"Portfolio generation did not complete within {max_iterations} iterations")
     
+    def _create_message(self, on_text: Optional[Callable[[str], None]] = None, **kwargs) -> Any:
+        """
+        Call Claude via the streaming API and return the complete message.
+        
+        Streaming lets callers show progress as tokens arrive; the SDK
+        accumulates text and tool_use input deltas into the final message,
+        so the result is identical to messages.create().
+        
+        Args:
+            on_text: Optional callback receiving each text delta
+            **kwargs: Arguments for client.messages.stream()
+            
+        Returns:
+            Final Claude API message object
+        """
+        with self.client.messages.stream(**kwargs) as stream:
+            if on_text:
+                for text in stream.text_stream:
+                    on_text(text)
+            return stream.get_final_message()
+    
+    def _compose_final_answer(
+        self,
+        messages: List[Dict],
+        system_prompt: str,
+        on_text: Optional[Callable[[str], None]] = None
+    ) -> Any:
+        """
+        Produce the final portfolio with the composer model.
+        
+        The planner's closing reply is discarded; the composer sees the same
+        conversation (including all tool results) and is not allowed to call
+        further tools.
+        
+        Args:
+            messages: Conversation messages gathered by the planner
+            system_prompt: System instructions for Claude
+            on_text: Optional callback receiving streamed text deltas
+            
+        Returns:
+            Claude API response object containing the final answer
+        """
+        logger.info(f"Composing final portfolio with {self.composer_model}")
+        
+        # Tools must still be declared since the conversation contains tool_use blocks
+        return self._create_message(
+            on_text=on_text,
+            model=self.composer_model,
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+            system=system_prompt,
+            messages=messages,
+            tools=self.tool_registry.get_anthropic_tools(),
+            tool_choice={"type": "none"}
+        )
+    
     def _execute_tool_requests(self, content_blocks: List) -> List[Dict]:
         """
         Execute all tool use requests from Claude's response.
         
         Claude can request multiple tools in a single response.
         Each tool_use block has: id, name, input
-        We execute each tool and return results with matching tool_use_id.
+        All tools are read-only, so multiple requests are executed
+        concurrently and results are returned in request order with
+        matching tool_use_id.
         
         Args:
             content_blocks: List of content blocks from Claude response
@@ -207,55 +301,69 @@ class AnthropicService:
         Returns:
             List of tool_result blocks to send back to Claude
         """
-        tool_results = []
-        
-        for block in content_blocks:
-            if block.type == "tool_use":
-                tool_name = block.name
-                tool_input = block.input
-                tool_use_id = block.id
-                print(f"  [TOOL CALL] {tool_name}")
-                print(f"  [TOOL INPUT] {json.dumps(tool_input, indent=2)}")
-                
-                logger.info(f"Executing tool: {tool_name}")
-                logger.debug(f"Tool input: {json.dumps(tool_input, indent=2)}")
-                
-                # Execute tool (safe_execute handles all errors)
-                try:
-                    result = self.tool_registry.execute_tool(tool_name, **tool_input)
-                    print(f"  [TOOL RESULT] {tool_name} returned {len(json.dumps(result))} chars")
-                    
-                    # Check if tool execution had errors
-                    if result.get('success', True):
-                        logger.info(f"Tool {tool_name} executed successfully")
-                    else:
-                        logger.warning(f"Tool {tool_name} returned error: {result.get('error_code')}")
-                    
-                    # Add tool result to conversation
-                    tool_results.append({
-                        "type": "tool_result",
-                        "tool_use_id": tool_use_id,
-                        "content": json.dumps(result, indent=2)
-                    })
-                    
-                except Exception as e:
-                    # This should rarely happen since safe_execute catches everything
-                    logger.error(f"Unexpected error executing tool {tool_name}: {e}")
-                    
-                    tool_results.append({
-                        "type": "tool_result",
-                        "tool_use_id": tool_use_id,
-                        "content": json.dumps({
-                            "error": str(e),
-                            "error_code": "UNKNOWN_ERROR",
-                            "success": False
-                        }),
-                        "is_error": True
-                    })
+        tool_blocks = [block for block in content_blocks if block.type == "tool_use"]
+        
+        if len(tool_blocks) > 1:
+            with ThreadPoolExecutor(max_workers=len(tool_blocks)) as executor:
+                tool_results = list(executor.map(self._execute_tool_block, tool_blocks))
+        else:
+            tool_results = [self._execute_tool_block(block) for block in tool_blocks]
         
         logger.info(f"Executed {len(tool_results)} tool(s)")
         return tool_results
     
+    def _execute_tool_block(self, block: Any) -> Dict:
+        """
+        Execute a single tool_use block.
+        
+        Args:
+            block: tool_use content block from Claude response
+            
+        Returns:
+            tool_result block to send back to Claude
+        """
+        tool_name = block.name
+        tool_input = block.input
+        tool_use_id = block.id
+        print(f"  [TOOL CALL] {tool_name}")
+        print(f"  [TOOL INPUT] {json.dumps(tool_input, indent=2)}")
+        
+        logger.info(f"Executing tool: {tool_name}")
+        logger.debug(f"Tool input: {json.dumps(tool_input, indent=2)}")
+        
+        # Execute tool (safe_execute handles all errors)
+        try:
+            result = self.tool_registry.execute_tool(tool_name, **tool_input)
+            print(f"  [TOOL RESULT] {tool_name} returned {len(json.dumps(result))} chars")
+            
+            # Check if tool execution had errors
+            if result.get('success', True):
+                logger.info(f"Tool {tool_name} executed successfully")
+            else:
+                logger.warning(f"Tool {tool_name} returned error: {result.get('error_code')}")
+            
+            # Add tool result to conversation
+            return {
+                "type": "tool_result",
+                "tool_use_id": tool_use_id,
+                "content": json.dumps(result, indent=2)
+            }
+            
+        except Exception as e:
+            # This should rarely happen since safe_execute catches everything
+            logger.error(f"Unexpected error executing tool {tool_name}: {e}")
+            
+            return {
+                "type": "tool_result",
+                "tool_use_id": tool_use_id,
+                "content": json.dumps({
+                    "error": str(e),
+                    "error_code": "UNKNOWN_ERROR",
+                    "success": False
+                }),
+                "is_error": True
+            }
+    
     def _extract_final_portfolio(
         self,
         response: Any,
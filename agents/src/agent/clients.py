@@ -0,0 +1,35 @@
+"""
+Process-wide API clients.
+A single Anthropic client (and its HTTP connection pool) is shared by every
+AnthropicService in the process, so TLS connections are reused across
+requests and test runs. The shared Firestore client lives in
+firebase_bootstrap.get_db().
+"""
+
+from functools import lru_cache
+
+import httpx
+from anthropic import Anthropic, DefaultHttpxClient
+
+from config import config
+
+# Short connect/write/pool timeouts fail fast on network problems; the read
+# timeout is per chunk, which is generous for streamed responses.
+ANTHROPIC_TIMEOUT = httpx.Timeout(connect=5.0, read=120.0, write=5.0, pool=5.0)
+
+# Keep idle connections open between agent loop iterations and requests
+ANTHROPIC_KEEPALIVE_EXPIRY = 600.0
+
+
+@lru_cache(maxsize=1)
+def get_anthropic_client() -> Anthropic:
+    """Get the shared Anthropic client for this process."""
+    return Anthropic(
+        api_key=config.anthropic_api_key,
+        max_retries=config.max_retries,
+        timeout=ANTHROPIC_TIMEOUT,
+        http_client=DefaultHttpxClient(
+            timeout=ANTHROPIC_TIMEOUT,
+            limits=httpx.Limits(keepalive_expiry=ANTHROPIC_KEEPALIVE_EXPIRY)
+        )
+    )
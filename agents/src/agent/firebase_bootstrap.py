@@ -0,0 +1,79 @@
+"""
+Process-wide Firebase bootstrap.
+Initializes the Firebase app and Firestore client once and shares them
+across all tools, so credentials are parsed and the gRPC channel is set up
+only once per process.
+"""
+
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, Any
+import os
+import logging
+import threading
+
+import firebase_admin
+from firebase_admin import credentials, firestore
+
+logger = logging.getLogger(__name__)
+
+# Serializes first-time initialization across threads
+_init_lock = threading.Lock()
+
+# Shared Firestore client, created on first get_db() call
+_db = None
+
+# How far in the past stale reads are served from (see stale_read_kwargs)
+STALE_READ_SECONDS = 30
+
+
+@lru_cache(maxsize=1)
+def get_app() -> firebase_admin.App:
+    """
+    Get the default Firebase app, initializing it on first use.
+
+    Reuses an app that was already initialized elsewhere (e.g. main.py).
+    Otherwise uses the service account file from GOOGLE_APPLICATION_CREDENTIALS
+    if set, falling back to Application Default Credentials.
+    """
+    with _init_lock:
+        try:
+            return firebase_admin.get_app()
+        except ValueError:
+            pass
+
+        cred_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
+        cred = credentials.Certificate(cred_path) if cred_path else None
+        app = firebase_admin.initialize_app(cred)
+        logger.info("Firebase app initialized")
+        return app
+
+
+def get_db():
+    """
+    Get the shared Firestore client for the default Firebase app.
+
+    Double-checked under _init_lock so concurrent first calls (e.g. a
+    warm-up thread and a tool) still build only one client.
+    """
+    global _db
+    if _db is None:
+        app = get_app()
+        with _init_lock:
+            if _db is None:
+                _db = firestore.client(app)
+                logger.info("Firestore client initialized")
+    return _db
+
+
+def stale_read_kwargs() -> Dict[str, Any]:
+    """
+    Get read options for reads that tolerate slightly stale data.
+
+    When FIRESTORE_STALE_OK=1, returns a read_time a few seconds in the past,
+    which Firestore can serve without waiting on the latest writes. Otherwise
+    returns no options, keeping reads strongly consistent (production default).
+    """
+    if os.getenv('FIRESTORE_STALE_OK') != '1':
+        return {}
+    return {'read_time': datetime.now(timezone.utc) - timedelta(seconds=STALE_READ_SECONDS)}
@@ -14,7 +14,7 @@ from .stock_universe_tool import StockUniverseTool
 from .stock_fundamentals_tool import StockFundamentalsTool
 from .market_sentiment_tool import MarketSentimentTool
 from .tool_registry import ToolRegistry
-from .cache import FirestoreCache
+from .cache import FirestoreCache, FileCache
 
 __all__ = [
     'BaseTool',
@@ -24,5 +24,6 @@ __all__ = [
     'StockFundamentalsTool',
     'MarketSentimentTool',
     'ToolRegistry',
-    'FirestoreCache'
+    'FirestoreCache',
+    'FileCache'
 ]
\ No newline at end of file
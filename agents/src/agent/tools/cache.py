@@ -1,5 +1,6 @@
-from firebase_admin import firestore
+from ..firebase_bootstrap import get_db
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from typing import Dict, Any, Optional
 import logging
 import hashlib
@@ -26,7 +27,7 @@ class FirestoreCache:
         self.cache_enabled = False
         
         try:
-            self.db = firestore.client()
+            self.db = get_db()
             self.collection = self.db.collection(collection_name)
             self.cache_enabled = True
             logger.info(f"Firestore cache initialized: {collection_name}")
@@ -175,4 +176,107 @@ class FirestoreCache:
             
         except Exception as e:
             logger.error(f"Stale cache get error: {e}")
-            return None
\ No newline at end of file
+            return None
+
+
+class FileCache:
+    """
+    Local JSON file cache with TTL support.
+    Used by local test scripts to avoid repeated Firestore reads for data
+    that changes at most daily. Entries live in <cache_dir>/<namespace>/.
+    """
+    
+    def __init__(self, namespace: str, cache_dir: str = ".cache", ttl_days: int = 1):
+        """
+        Initialize file cache.
+        
+        Args:
+            namespace: Sub-directory for this cache (e.g. tool or collection name)
+            cache_dir: Root directory for cache files
+            ttl_days: Time-to-live in days
+        """
+        self.directory = Path(cache_dir) / namespace
+        self.ttl = timedelta(days=ttl_days)
+    
+    def _generate_cache_key(self, **kwargs) -> str:
+        """
+        Generate deterministic cache key from parameters.
+        
+        Args:
+            **kwargs: Parameters to hash
+            
+        Returns:
+            MD5 hash as cache key
+        """
+        key_string = json.dumps(kwargs, sort_keys=True)
+        return hashlib.md5(key_string.encode()).hexdigest()
+    
+    def _path(self, cache_key: str) -> Path:
+        """Get file path for a cache key."""
+        return self.directory / f"{cache_key}.json"
+    
+    def get(self, **kwargs) -> Optional[Dict[str, Any]]:
+        """
+        Get cached data if exists and not expired.
+        
+        Args:
+            **kwargs: Cache key parameters
+            
+        Returns:
+            Cached data dict or None if miss/expired
+        """
+        cache_key = self._generate_cache_key(**kwargs)
+        path = self._path(cache_key)
+        
+        if not path.exists():
+            logger.debug(f"File cache miss: {cache_key[:8]}...")
+            return None
+        
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            
+            cached_at = datetime.fromisoformat(entry['cached_at'])
+            if datetime.now(timezone.utc) - cached_at > self.ttl:
+                logger.info(f"File cache expired: {cache_key[:8]}...")
+                return None
+            
+            logger.info(f"File cache hit: {cache_key[:8]}...")
+            return entry.get('value')
+            
+        except Exception as e:
+            logger.error(f"File cache get error: {e}")
+            return None
+    
+    def set(self, value: Dict[str, Any], **kwargs) -> bool:
+        """
+        Store data in cache with timestamp.
+        
+        Args:
+            value: Data to cache
+            **kwargs: Cache key parameters
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        cache_key = self._generate_cache_key(**kwargs)
+        
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            
+            cache_entry = {
+                'value': value,
+                'cached_at': datetime.now(timezone.utc).isoformat(),
+                'key_params': kwargs
+            }
+            
+            with open(self._path(cache_key), 'w', encoding='utf-8') as f:
+                # Firestore timestamps are not JSON-native; store them as strings
+                json.dump(cache_entry, f, default=str)
+            
+            logger.info(f"File cache set: {cache_key[:8]}...")
+            return True
+            
+        except Exception as e:
+            logger.error(f"File cache set error: {e}")
+            return False
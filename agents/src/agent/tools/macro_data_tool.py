@@ -4,7 +4,7 @@ Data populated by batch_load_macro.py from FRED and World Bank APIs.
 """
 
 from typing import Dict, Any
-from firebase_admin import firestore
+from ..firebase_bootstrap import get_db
 from .base import BaseTool, ToolError
 import logging
 
@@ -20,7 +20,7 @@ class MacroEconomicDataTool(BaseTool):
     def __init__(self):
         """Initialize with Firestore client."""
         try:
-            self.db = firestore.client()
+            self.db = get_db()
             self.collection = self.db.collection('macro_economic_data')
             logger.info("MacroEconomicDataTool initialized")
         except Exception as e:
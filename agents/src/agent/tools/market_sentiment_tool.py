@@ -18,7 +18,7 @@ import logging
 import requests
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timezone, timedelta
-from firebase_admin import firestore
+from ..firebase_bootstrap import get_db
 from .base import BaseTool, ToolError
 
 logger = logging.getLogger(__name__)
@@ -41,7 +41,7 @@ class MarketSentimentTool(BaseTool):
     def __init__(self):
         """Initialize with Firestore client and configuration."""
         try:
-            self.db = firestore.client()
+            self.db = get_db()
             self.sentiment_collection = self.db.collection('market_sentiment')
             self.config_collection = self.db.collection('config')
             self.usage_collection = self.db.collection('api_usage')
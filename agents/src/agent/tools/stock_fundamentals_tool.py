@@ -3,9 +3,10 @@ Stock Fundamentals Tool - Reads from Firestore cache.
 Data populated by batch_load_fundamentals.py from Twelve Data API.
 """
 
-from typing import Dict, Any, List
-from firebase_admin import firestore
+from typing import Dict, Any, List, Optional
+from ..firebase_bootstrap import get_db, stale_read_kwargs
 from .base import BaseTool, ToolError
+from .cache import FileCache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,10 +17,16 @@ class StockFundamentalsTool(BaseTool):
     Retrieves detailed fundamental metrics for specific stocks.
     """
     
-    def __init__(self):
-        """Initialize with Firestore client."""
+    def __init__(self, file_cache: Optional[FileCache] = None):
+        """
+        Initialize with Firestore client.
+        
+        Args:
+            file_cache: Optional local file cache for lookup results
+        """
+        self.file_cache = file_cache
         try:
-            self.db = firestore.client()
+            self.db = get_db()
             self.collection = self.db.collection('stock_fundamentals')
             logger.info("StockFundamentalsTool initialized")
         except Exception as e:
@@ -87,17 +94,27 @@ Data source: Twelve Data API (refreshed periodically)"""
                 user_message="Please limit to 30 stocks maximum per request"
             )
         
+        cache_params = {"symbols": sorted(symbol.upper() for symbol in symbols)}
+        if self.file_cache:
+            cached = self.file_cache.get(**cache_params)
+            if cached is not None:
+                return cached
+        
         try:
             fundamentals = {}
             missing_symbols = []
             
-            for symbol in symbols:
-                # Normalize symbol to uppercase
-                symbol_upper = symbol.upper()
-                doc_ref = self.collection.document(symbol_upper)
-                doc = doc_ref.get()
+            # Normalize symbols to uppercase (preserving request order, no duplicates)
+            symbols_upper = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+            doc_refs = [self.collection.document(symbol) for symbol in symbols_upper]
+            
+            # Single batched read instead of one round-trip per symbol
+            snapshots = {doc.id: doc for doc in self.db.get_all(doc_refs, **stale_read_kwargs())}
+            
+            for symbol_upper in symbols_upper:
+                doc = snapshots.get(symbol_upper)
                 
-                if doc.exists:
+                if doc is not None and doc.exists:
                     fundamentals[symbol_upper] = doc.to_dict()
                 else:
                     missing_symbols.append(symbol_upper)
@@ -125,6 +142,9 @@ Data source: Twelve Data API (refreshed periodically)"""
                     "missing_count": len(missing_symbols)
                 }
             
+            if self.file_cache:
+                self.file_cache.set(result, **cache_params)
+            
             return result
             
         except Exception as e:
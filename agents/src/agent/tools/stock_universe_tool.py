@@ -3,22 +3,32 @@ Stock Universe Tool - Reads from Firestore cache.
 """
 
 from typing import Dict, Any, List, Optional
-from firebase_admin import firestore
+from ..firebase_bootstrap import get_db, stale_read_kwargs
 from .base import BaseTool, ToolError
+from .cache import FileCache
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Firestore limit on values in a single 'in' filter
+MAX_IN_QUERY_VALUES = 30
+
 
 class StockUniverseTool(BaseTool):
     """
     Retrieves available stocks for a country, optionally filtered by sector.
     """
     
-    def __init__(self):
-        """Initialize with Firestore client."""
+    def __init__(self, file_cache: Optional[FileCache] = None):
+        """
+        Initialize with Firestore client.
+        
+        Args:
+            file_cache: Optional local file cache for query results
+        """
+        self.file_cache = file_cache
         try:
-            self.db = firestore.client()
+            self.db = get_db()
             self.collection = self.db.collection('stock_universe')
             logger.info("StockUniverseTool initialized")
         except Exception as e:
@@ -79,15 +89,30 @@ Sectors available: technology, healthcare, finance, energy, consumer_staples, co
                 user_message="Stock data temporarily unavailable"
             )
         
+        # Drop duplicate sectors so the whole filter fits one 'in' query
+        sectors = list(dict.fromkeys(sectors)) if sectors else None
+        if sectors and len(sectors) > MAX_IN_QUERY_VALUES:
+            return ToolError.create(
+                code=ToolError.INVALID_PARAMETERS,
+                message=f"Too many sectors requested: {len(sectors)}",
+                user_message=f"Please limit to {MAX_IN_QUERY_VALUES} sectors maximum per request"
+            )
+        
+        cache_params = {"country": country, "sectors": sorted(sectors or [])}
+        if self.file_cache:
+            cached = self.file_cache.get(**cache_params)
+            if cached is not None:
+                return cached
+        
         try:
             # Query Firestore for this country
             query = self.collection.where('country', '==', country)
             
             if sectors:
-                # Filter by sectors
+                # Filter by all sectors in a single round-trip
                 query = query.where('sector', 'in', sectors)
             
-            docs = query.stream()
+            docs = query.stream(**stale_read_kwargs())
             
             # Organize results
             stocks_by_sector = {}
@@ -108,7 +133,7 @@ Sectors available: technology, healthcare, finance, energy, consumer_staples, co
                     user_message=f"No stocks available for {country}"
                 )
             
-            return {
+            result = {
                 "success": True,
                 "data": {
                     "country": country,
@@ -118,6 +143,11 @@ Sectors available: technology, healthcare, finance, energy, consumer_staples, co
                 }
             }
             
+            if self.file_cache:
+                self.file_cache.set(result, **cache_params)
+            
+            return result
+            
         except Exception as e:
             logger.error(f"Error querying stock universe: {e}")
             return ToolError.create(
@@ -8,7 +8,7 @@ Registers all tools that the portfolio agent can use:
 - MarketSentimentTool: Gets analyst ratings, recommendations, price targets
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 from .base import BaseTool, ToolError
 from .macro_data_tool import MacroEconomicDataTool
 from .stock_universe_tool import StockUniverseTool
@@ -30,6 +30,7 @@ class ToolRegistry:
             fred_key: FRED API key for macro data tool
         """
         self._tools: Dict[str, BaseTool] = {}
+        self._anthropic_tools: Optional[List[Dict]] = None
         self._register_tools(alpha_vantage_key,fred_key)
     
     def _register_tools(self, alpha_vantage_key: str = None, fred_key: str = None):
@@ -56,6 +57,7 @@ class ToolRegistry:
     def register(self, tool: BaseTool):
         """Register a tool."""
         self._tools[tool.name] = tool
+        self._anthropic_tools = None  # Invalidate cached tool schemas
         logger.info(f"Registered tool: {tool.name}")
     
     def get_tool(self, name: str) -> BaseTool:
@@ -69,8 +71,15 @@ class ToolRegistry:
         return list(self._tools.values())
     
     def get_anthropic_tools(self) -> List[Dict]:
-        """Get tools in Anthropic API format."""
-        return [tool.to_anthropic_format() for tool in self._tools.values()]
+        """
+        Get tools in Anthropic API format.
+        
+        The list is built once and reused until another tool is registered;
+        callers must treat it as read-only.
+        """
+        if self._anthropic_tools is None:
+            self._anthropic_tools = [tool.to_anthropic_format() for tool in self._tools.values()]
+        return self._anthropic_tools
     
     def execute_tool(self, tool_name: str, **kwargs) -> Dict:
         """
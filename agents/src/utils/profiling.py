@@ -0,0 +1,41 @@
+"""
+Profiling utilities for local scripts.
+Wraps cProfile so slow runs can be reported with a ranked list of hot spots.
+"""
+
+import cProfile
+import io
+import pstats
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+
+@contextmanager
+def maybe_profile(output_file: Optional[Path], top: int = 20) -> Iterator[None]:
+    """
+    Profile the enclosed block if an output file is given.
+
+    Prints the top entries by cumulative time and writes the raw stats to
+    output_file (viewable with pstats, snakeviz, etc.). Only the calling
+    thread is profiled.
+
+    Args:
+        output_file: Where to dump .prof stats, or None to disable profiling
+        top: Number of entries to print
+    """
+    if output_file is None:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(top)
+        print(stream.getvalue())
+        profiler.dump_stats(output_file)
+        print(f"Profile saved to: {output_file}")
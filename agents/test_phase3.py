@@ -87,7 +87,8 @@ try:
         fred_key=config.fred_api_key
     )
     print(f"AnthropicService initialized")
-    print(f"   - Model: {service.model}")
+    print(f"   - Planner model: {service.planner_model}")
+    print(f"   - Composer model: {service.composer_model}")
     print(f"   - Max tokens: {service.max_tokens}")
     print(f"   - Tools available: {len(service.tool_registry.get_all_tools())}")
 except Exception as e: